@@ -0,0 +1,50 @@
+"""Add secondary indexes for foreign keys and filtered columns
+
+Revision ID: 5f2c8e1a9b47
+Revises: bd7ca04a74d3
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f2c8e1a9b47'
+down_revision = 'bd7ca04a74d3'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_client_info_apt_id', 'client_info', ['apt_id']),
+    ('ix_payments_client_id', 'payments', ['client_id']),
+    ('ix_payments_payment_type_id', 'payments', ['payment_type_id']),
+    ('ix_payments_date_of_payment', 'payments', ['date_of_payment']),
+    ('ix_history_type_id', 'history', ['type_id']),
+    ('ix_history_entity_id', 'history', ['entity_id']),
+    ('ix_history_datetime', 'history', ['datetime']),
+    ('ix_apartment_info_building_floor_apt_no', 'apartment_info', ['building', 'floor', 'apt_no']),
+]
+
+
+def upgrade():
+    # The QR system tables are created by init_db rather than by a
+    # migration, so they may not exist yet; init_db then creates them with
+    # these indexes from the models
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for name, table, columns in INDEXES:
+        if table not in tables:
+            continue
+        if name in {index['name'] for index in inspector.get_indexes(table)}:
+            continue
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for name, table, _ in reversed(INDEXES):
+        if table in tables and name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
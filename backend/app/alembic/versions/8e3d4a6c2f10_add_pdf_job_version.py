@@ -0,0 +1,38 @@
+"""Point PDF jobs at their archived contract version
+
+Revision ID: 8e3d4a6c2f10
+Revises: 5f2c8e1a9b47
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e3d4a6c2f10'
+down_revision = '5f2c8e1a9b47'
+branch_labels = None
+depends_on = None
+
+
+def _has_pdf_jobs() -> bool:
+    return 'pdf_jobs' in sa.inspect(op.get_bind()).get_table_names()
+
+
+def _columns() -> set[str]:
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns('pdf_jobs')}
+
+
+def upgrade():
+    # pdf_jobs is created by init_db; only databases made before this
+    # column existed need it added
+    if _has_pdf_jobs() and 'version' not in _columns():
+        with op.batch_alter_table('pdf_jobs') as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    if _has_pdf_jobs() and 'version' in _columns():
+        with op.batch_alter_table('pdf_jobs') as batch_op:
+            batch_op.drop_column('version')
@@ -3,7 +3,8 @@ from typing import Any
 from fastapi import APIRouter, HTTPException
 from sqlmodel import func, select
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, CurrentUser, SessionDep
+from app.core.writer import db_writer, delete_row, insert_row, update_row
 from app.models import (
     ApartmentInfo,
     ApartmentInfoCreate,
@@ -16,23 +17,23 @@ router = APIRouter(prefix="/apartments", tags=["apartments"])
 
 
 @router.get("/", response_model=list[ApartmentInfoPublic])
-def read_apartments(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_apartments(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, skip: int = 0, limit: int = 100
 ) -> Any:
     """
     Retrieve apartments.
     """
     statement = select(ApartmentInfo).offset(skip).limit(limit)
-    apartments = session.exec(statement).all()
+    apartments = (await session.exec(statement)).all()
     return apartments
 
 
 @router.get("/{id}", response_model=ApartmentInfoPublic)
-def read_apartment(session: SessionDep, current_user: CurrentUser, id: int) -> Any:
+async def read_apartment(session: AsyncSessionDep, current_user: AsyncCurrentUser, id: int) -> Any:
     """
     Get apartment by ID.
     """
-    apartment = session.get(ApartmentInfo, id)
+    apartment = await session.get(ApartmentInfo, id)
     if not apartment:
         raise HTTPException(status_code=404, detail="Apartment not found")
     return apartment
@@ -48,10 +49,7 @@ def create_apartment(
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
         
-    apartment = ApartmentInfo.model_validate(apartment_in)
-    session.add(apartment)
-    session.commit()
-    session.refresh(apartment)
+    apartment = db_writer.submit(insert_row(ApartmentInfo, apartment_in))
     return apartment
 
 
@@ -74,10 +72,9 @@ def update_apartment(
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     update_dict = apartment_in.model_dump(exclude_unset=True)
-    apartment.sqlmodel_update(update_dict)
-    session.add(apartment)
-    session.commit()
-    session.refresh(apartment)
+    apartment = db_writer.submit(update_row(ApartmentInfo, id, update_dict))
+    if not apartment:
+        raise HTTPException(status_code=404, detail="Apartment not found")
     return apartment
 
 
@@ -93,6 +90,6 @@ def delete_apartment(session: SessionDep, current_user: CurrentUser, id: int) ->
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    session.delete(apartment)
-    session.commit()
+    if not db_writer.submit(delete_row(ApartmentInfo, id)):
+        raise HTTPException(status_code=404, detail="Apartment not found")
     return Message(message="Apartment deleted successfully") 
\ No newline at end of file
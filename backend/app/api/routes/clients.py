@@ -3,7 +3,9 @@ from typing import Any, Optional
 from fastapi import APIRouter, HTTPException, Query
 from sqlmodel import func, select, or_, and_
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, CurrentUser, SessionDep
+from app.core.search import match_expression, search_statement
+from app.core.writer import db_writer, delete_row, insert_row, update_row
 from app.models import (
     ClientInfo,
     ClientInfoCreate,
@@ -17,21 +19,21 @@ router = APIRouter(prefix="/clients", tags=["clients"])
 
 
 @router.get("/", response_model=list[ClientInfoPublic])
-def read_clients(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_clients(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, skip: int = 0, limit: int = 100
 ) -> Any:
     """
     Retrieve clients.
     """
     statement = select(ClientInfo).offset(skip).limit(limit)
-    clients = session.exec(statement).all()
+    clients = (await session.exec(statement)).all()
     return clients
 
 
 @router.get("/filter", response_model=list[ClientInfoPublic])
-def filter_clients(
-    session: SessionDep,
-    current_user: CurrentUser,
+async def filter_clients(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
     name: Optional[str] = None,
     id_no: Optional[int] = None,
     phone_number: Optional[str] = None,
@@ -77,28 +79,47 @@ def filter_clients(
     query = query.offset(skip).limit(limit)
     
     # Execute query and return results
-    clients = session.exec(query).all()
+    clients = (await session.exec(query)).all()
+    return clients
+
+
+@router.get("/search", response_model=list[ClientInfoPublic])
+async def search_clients(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    q: str = Query(min_length=1, max_length=200),
+    skip: int = 0,
+    limit: int = Query(default=20, le=100),
+) -> Any:
+    """
+    Search clients by the start of any word of their name, alternate name,
+    phone numbers, registry or newspaper number, best match first.
+    """
+    expression = match_expression(q)
+    if expression is None:
+        return []
+    clients = (await session.exec(search_statement(expression, skip, limit))).all()
     return clients
 
 
 @router.get("/by-apartment/{apt_id}", response_model=list[ClientInfoPublic])
-def read_clients_by_apartment(
-    session: SessionDep, current_user: CurrentUser, apt_id: int
+async def read_clients_by_apartment(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, apt_id: int
 ) -> Any:
     """
     Get clients by apartment ID.
     """
     statement = select(ClientInfo).where(ClientInfo.apt_id == apt_id)
-    clients = session.exec(statement).all()
+    clients = (await session.exec(statement)).all()
     return clients
 
 
 @router.get("/{id}", response_model=ClientInfoPublic)
-def read_client(session: SessionDep, current_user: CurrentUser, id: int) -> Any:
+async def read_client(session: AsyncSessionDep, current_user: AsyncCurrentUser, id: int) -> Any:
     """
     Get client by ID.
     """
-    client = session.get(ClientInfo, id)
+    client = await session.get(ClientInfo, id)
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     return client
@@ -114,10 +135,7 @@ def create_client(
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
         
-    client = ClientInfo.model_validate(client_in)
-    session.add(client)
-    session.commit()
-    session.refresh(client)
+    client = db_writer.submit(insert_row(ClientInfo, client_in))
     return client
 
 
@@ -140,10 +158,9 @@ def update_client(
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     update_dict = client_in.model_dump(exclude_unset=True)
-    client.sqlmodel_update(update_dict)
-    session.add(client)
-    session.commit()
-    session.refresh(client)
+    client = db_writer.submit(update_row(ClientInfo, id, update_dict))
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
     return client
 
 
@@ -159,6 +176,6 @@ def delete_client(session: SessionDep, current_user: CurrentUser, id: int) -> Me
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    session.delete(client)
-    session.commit()
+    if not db_writer.submit(delete_row(ClientInfo, id)):
+        raise HTTPException(status_code=404, detail="Client not found")
     return Message(message="Client deleted successfully")
\ No newline at end of file
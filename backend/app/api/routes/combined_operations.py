@@ -1,9 +1,10 @@
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
-from sqlmodel import select, SQLModel
+from sqlmodel import Session, select, SQLModel
 
 from app.api.deps import CurrentUser, SessionDep
+from app.core.writer import db_writer
 from app.models import (
     ApartmentInfo,
     ApartmentInfoCreate,
@@ -45,36 +46,34 @@ def create_apartment_client_payment(
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    # Create apartment
-    apartment = ApartmentInfo.model_validate(data.apartment)
-    session.add(apartment)
-    session.flush()  # Flush to get the apartment ID without committing
-    
-    # Create client with the apartment ID
-    client_data = data.client.model_dump()
-    client_data["apt_id"] = apartment.id  # Set the apartment ID
-    client = ClientInfo.model_validate(client_data)
-    session.add(client)
-    session.flush()  # Flush to get the client ID without committing
-    
-    # Create payment with the client ID
-    payment_data = data.payment.model_dump()
-    payment_data["client_id"] = client.id  # Set the client ID
-    payment = Payment.model_validate(payment_data)
-    session.add(payment)
-    
-    # Commit the transaction
-    try:
-        session.commit()
-        session.refresh(apartment)
-        session.refresh(client)
-        session.refresh(payment)
-        
+    def create(writer_session: Session) -> ApartmentClientPaymentResponse:
+        # Create apartment
+        apartment = ApartmentInfo.model_validate(data.apartment)
+        writer_session.add(apartment)
+        writer_session.flush()  # Flush to get the apartment ID without committing
+
+        # Create client with the apartment ID
+        client_data = data.client.model_dump()
+        client_data["apt_id"] = apartment.id  # Set the apartment ID
+        client = ClientInfo.model_validate(client_data)
+        writer_session.add(client)
+        writer_session.flush()  # Flush to get the client ID without committing
+
+        # Create payment with the client ID
+        payment_data = data.payment.model_dump()
+        payment_data["client_id"] = client.id  # Set the client ID
+        payment = Payment.model_validate(payment_data)
+        writer_session.add(payment)
+        writer_session.flush()
+
         return ApartmentClientPaymentResponse(
             apartment_id=apartment.id,
             client_id=client.id,
             payment_id=payment.id
         )
+
+    # The writer commits all three rows in one transaction
+    try:
+        return db_writer.submit(create)
     except Exception as e:
-        session.rollback()
-        raise HTTPException(status_code=400, detail=f"Error creating records: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=f"Error creating records: {str(e)}")
@@ -3,7 +3,8 @@ from typing import Any
 from fastapi import APIRouter, HTTPException
 from sqlmodel import func, select
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, CurrentUser, SessionDep
+from app.core.writer import db_writer, delete_row, insert_row, update_row
 from app.models import (
     History,
     HistoryCreate,
@@ -21,23 +22,23 @@ router = APIRouter(tags=["history"])
 
 # History Types Routes
 @router.get("/history-types", response_model=list[HistoryTypePublic], tags=["history-types"])
-def read_history_types(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_history_types(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, skip: int = 0, limit: int = 100
 ) -> Any:
     """
     Retrieve history types.
     """
     statement = select(HistoryType).offset(skip).limit(limit)
-    history_types = session.exec(statement).all()
+    history_types = (await session.exec(statement)).all()
     return history_types
 
 
 @router.get("/history-types/{id}", response_model=HistoryTypePublic, tags=["history-types"])
-def read_history_type(session: SessionDep, current_user: CurrentUser, id: int) -> Any:
+async def read_history_type(session: AsyncSessionDep, current_user: AsyncCurrentUser, id: int) -> Any:
     """
     Get history type by ID.
     """
-    history_type = session.get(HistoryType, id)
+    history_type = await session.get(HistoryType, id)
     if not history_type:
         raise HTTPException(status_code=404, detail="History type not found")
     return history_type
@@ -53,10 +54,7 @@ def create_history_type(
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
         
-    history_type = HistoryType.model_validate(history_type_in)
-    session.add(history_type)
-    session.commit()
-    session.refresh(history_type)
+    history_type = db_writer.submit(insert_row(HistoryType, history_type_in))
     return history_type
 
 
@@ -79,10 +77,9 @@ def update_history_type(
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     update_dict = history_type_in.model_dump(exclude_unset=True)
-    history_type.sqlmodel_update(update_dict)
-    session.add(history_type)
-    session.commit()
-    session.refresh(history_type)
+    history_type = db_writer.submit(update_row(HistoryType, id, update_dict))
+    if not history_type:
+        raise HTTPException(status_code=404, detail="History type not found")
     return history_type
 
 
@@ -98,42 +95,42 @@ def delete_history_type(session: SessionDep, current_user: CurrentUser, id: int)
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    session.delete(history_type)
-    session.commit()
+    if not db_writer.submit(delete_row(HistoryType, id)):
+        raise HTTPException(status_code=404, detail="History type not found")
     return Message(message="History type deleted successfully")
 
 
 # History Entries Routes
 @router.get("/history", response_model=list[HistoryPublic], tags=["history-entries"])
-def read_histories(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_histories(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, skip: int = 0, limit: int = 100
 ) -> Any:
     """
     Retrieve history entries.
     """
     statement = select(History).offset(skip).limit(limit)
-    histories = session.exec(statement).all()
+    histories = (await session.exec(statement)).all()
     return histories
 
 
 @router.get("/history/by-type/{type_id}", response_model=list[HistoryPublic], tags=["history-entries"])
-def read_histories_by_type(
-    session: SessionDep, current_user: CurrentUser, type_id: int
+async def read_histories_by_type(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, type_id: int
 ) -> Any:
     """
     Get history entries by type ID.
     """
     statement = select(History).where(History.type_id == type_id)
-    histories = session.exec(statement).all()
+    histories = (await session.exec(statement)).all()
     return histories
 
 
 @router.get("/history/{id}", response_model=HistoryPublic, tags=["history-entries"])
-def read_history(session: SessionDep, current_user: CurrentUser, id: int) -> Any:
+async def read_history(session: AsyncSessionDep, current_user: AsyncCurrentUser, id: int) -> Any:
     """
     Get history entry by ID.
     """
-    history = session.get(History, id)
+    history = await session.get(History, id)
     if not history:
         raise HTTPException(status_code=404, detail="History entry not found")
     return history
@@ -149,10 +146,7 @@ def create_history(
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
         
-    history = History.model_validate(history_in)
-    session.add(history)
-    session.commit()
-    session.refresh(history)
+    history = db_writer.submit(insert_row(History, history_in))
     return history
 
 
@@ -175,10 +169,9 @@ def update_history(
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     update_dict = history_in.model_dump(exclude_unset=True)
-    history.sqlmodel_update(update_dict)
-    session.add(history)
-    session.commit()
-    session.refresh(history)
+    history = db_writer.submit(update_row(History, id, update_dict))
+    if not history:
+        raise HTTPException(status_code=404, detail="History entry not found")
     return history
 
 
@@ -194,6 +187,6 @@ def delete_history(session: SessionDep, current_user: CurrentUser, id: int) -> M
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    session.delete(history)
-    session.commit()
+    if not db_writer.submit(delete_row(History, id)):
+        raise HTTPException(status_code=404, detail="History entry not found")
     return Message(message="History entry deleted successfully") 
\ No newline at end of file
@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException
 from sqlmodel import func, select
 
 from app.api.deps import CurrentUser, SessionDep
+from app.core.writer import db_writer, delete_row, insert_row, update_row
 from app.models import Item, ItemCreate, ItemPublic, ItemsPublic, ItemUpdate, Message
 
 router = APIRouter(prefix="/items", tags=["items"])
@@ -55,16 +56,11 @@ def read_item(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) ->
 
 
 @router.post("/", response_model=ItemPublic)
-def create_item(
-    *, session: SessionDep, current_user: CurrentUser, item_in: ItemCreate
-) -> Any:
+def create_item(*, current_user: CurrentUser, item_in: ItemCreate) -> Any:
     """
     Create new item.
     """
-    item = Item.model_validate(item_in, update={"owner_id": current_user.id})
-    session.add(item)
-    session.commit()
-    session.refresh(item)
+    item = db_writer.submit(insert_row(Item, item_in, owner_id=current_user.id))
     return item
 
 
@@ -85,10 +81,9 @@ def update_item(
     if not current_user.is_superuser and (item.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     update_dict = item_in.model_dump(exclude_unset=True)
-    item.sqlmodel_update(update_dict)
-    session.add(item)
-    session.commit()
-    session.refresh(item)
+    item = db_writer.submit(update_row(Item, id, update_dict))
+    if not item:
+        raise HTTPException(status_code=404, detail="Item not found")
     return item
 
 
@@ -104,6 +99,6 @@ def delete_item(
         raise HTTPException(status_code=404, detail="Item not found")
     if not current_user.is_superuser and (item.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    session.delete(item)
-    session.commit()
+    if not db_writer.submit(delete_row(Item, id)):
+        raise HTTPException(status_code=404, detail="Item not found")
     return Message(message="Item deleted successfully")
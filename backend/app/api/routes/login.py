@@ -10,7 +10,8 @@ from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
 from app.core import security
 from app.core.config import settings
 from app.core.security import get_password_hash
-from app.models import Message, NewPassword, Token, UserPublic
+from app.core.writer import db_writer
+from app.models import Message, NewPassword, Token, UserPublic, UserUpdate
 from app.utils import (
     generate_password_reset_token,
     generate_reset_password_email,
@@ -91,10 +92,16 @@ def reset_password(session: SessionDep, body: NewPassword) -> Message:
         )
     elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    user_update = UserUpdate(password=body.new_password)
     hashed_password = get_password_hash(password=body.new_password)
-    user.hashed_password = hashed_password
-    session.add(user)
-    session.commit()
+    db_writer.submit(
+        lambda session: crud.update_user_by_id(
+            session=session,
+            user_id=user.id,
+            user_in=user_update,
+            hashed_password=hashed_password,
+        )
+    )
     return Message(message="Password updated successfully")
 
 
@@ -1,25 +1,44 @@
-from typing import Any
+import asyncio
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Optional
 from app.core import db
-from app.models import ApartmentInfo, ClientInfo, Payment
-from fastapi import APIRouter, HTTPException, Request, Response
+from app.models import (
+    ApartmentInfo, ClientInfo, ContractVersion, ContractVersionPublic, ContractVersionsPublic, PdfJobPublic, PdfJobStatus
+)
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import StreamingResponse
-import io
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.utils import ImageReader
-from PIL import Image, ImageDraw
-import tempfile
-import os
-import asyncio
-from playwright.async_api import async_playwright
+from fastapi.responses import PlainTextResponse, StreamingResponse
+import logging
 from app.api.deps import CurrentUser
-from sqlmodel import Session, select
+from app.core.config import settings
+from app.pdf.admission import RenderQueueFull, render_admission
+from app.pdf.archive import contract_archive
+from app.pdf.batch import stream_contracts_zip
+from app.pdf.browser_pool import browser_pool
+from app.pdf.cache import contract_cache_key
+from app.pdf.document import error_page_html
+from app.pdf.assets import static_assets
+from app.pdf.engines import BrowserEngine, ContractEngine, PrintEngine, native_engine
+from app.pdf.jobs import pdf_jobs
+from app.pdf.merge import PrintedPart, stream_merged
+from app.pdf.metrics import stage_metrics
+from app.pdf.page_cache import apartment_type_pages, static_pages
+from app.pdf.responses import archived_file_response
+from app.pdf.warmup import pdf_warmup
+from app.pdf.workers import render_workers
+from sqlmodel import Session, SQLModel, select
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/pages", tags=["pages"])
 
 templates = Jinja2Templates(directory="app/templates")
 
+# Pages that only depend on the apartment type; printed once per type
+APARTMENT_TYPE_PAGE_NUMBERS = {8, 9}
+
 @router.get("/")
 def read_pages(request : Request, no : int, apt_id : int) -> Any:
     with Session(db.engine) as session:
@@ -134,298 +153,418 @@ def read_page10(request : Request, apt_id : int) -> Any:
         }
     return templates.TemplateResponse("page/page10.html", {"request": request , 'data': data})
 
-# async def capture_page_pdfs(base_url: str, page_endpoints: list[str], output_dir: str) -> list[str]:
-#     """
-#     Capture PDFs of each page directly using Playwright.
-    
-#     Args:
-#         base_url: The base URL of the application
-#         page_endpoints: List of page endpoints to capture
-#         output_dir: Directory to save the PDFs
-        
-#     Returns:
-#         List of paths to the saved PDFs
-#     """
-#     pdf_paths = []
-    
-#     async with async_playwright() as p:
-#         # Launch browser
-#         browser = await p.chromium.launch(headless=True)
-        
-#         # Create a high-quality context
-#         context = await browser.new_context(
-#             viewport={"width": 1280, "height": 1696},  # Wide enough for A4
-#             device_scale_factor=2.0,  # Higher quality rendering
-#             is_mobile=False,
-#             has_touch=False,
-#             ignore_https_errors=True
-#         )
-        
-#         # Enable console logging
-#         page = await context.new_page()
-#         page.on("console", lambda msg: print(f"BROWSER LOG: {msg.text}"))
-#         page.on("pageerror", lambda err: print(f"BROWSER ERROR: {err}"))
-        
-#         for i, endpoint in enumerate(page_endpoints):
-#             try:
-#                 full_url = f"{base_url.rstrip('/')}{endpoint}"
-#                 print(f"Navigating to: {full_url}")
-                
-#                 # Navigate to the page with longer timeout
-#                 response = await page.goto(full_url, wait_until="networkidle", timeout=30000)
-                
-#                 # Check if the navigation was successful
-#                 if response.status >= 400:
-#                     print(f"Error loading page {endpoint}: HTTP {response.status}")
-#                     # Create a simple error PDF
-#                     pdf_path = os.path.join(output_dir, f"page_{i+1}_error.pdf")
-#                     # Use reportlab to create an error PDF
-#                     from reportlab.pdfgen import canvas
-#                     c = canvas.Canvas(pdf_path, pagesize=A4)
-#                     c.drawString(100, 500, f"Error loading page: HTTP {response.status}")
-#                     c.save()
-#                     pdf_paths.append(pdf_path)
-#                     continue
-                
-#                 # Wait a bit for any JavaScript to finish rendering
-#                 await asyncio.sleep(2)
-                
-#                 # Optimize the page for PDF printing
-#                 await page.evaluate("""() => {
-#                     document.body.style.width = '210mm';
-#                     document.body.style.height = '297mm';
-#                     document.body.style.margin = '0';
-#                     document.body.style.padding = '0';
-#                     document.documentElement.style.width = '210mm';
-#                     document.documentElement.style.height = '297mm';
-#                     document.documentElement.style.margin = '0';
-#                     document.documentElement.style.padding = '0';
-                    
-#                     // Force all elements to properly fit
-#                     const allElements = document.querySelectorAll('*');
-#                     for (const el of allElements) {
-#                         if (el.style.position === 'fixed' || el.style.position === 'absolute') {
-#                             el.style.maxWidth = '210mm';
-#                         }
-#                     }
-                    
-#                     // Set print-specific CSS
-#                     const style = document.createElement('style');
-#                     style.textContent = `
-#                         @media print {
-#                             body {
-#                                 width: 210mm;
-#                                 height: 297mm;
-#                                 margin: 0;
-#                                 padding: 0;
-#                             }
-#                             * {
-#                                 page-break-inside: avoid;
-#                             }
-#                         }
-#                     `;
-#                     document.head.appendChild(style);
-#                 }""")
-                
-#                 # Generate a PDF directly
-#                 pdf_path = os.path.join(output_dir, f"page_{i+1}.pdf")
-#                 await page.pdf(
-#                     path=pdf_path,
-#                     format="A4",
-#                     print_background=True,
-#                     prefer_css_page_size=True,
-#                     margin={"top": "0mm", "right": "0mm", "bottom": "0mm", "left": "0mm"},
-#                     scale=1.0  # No scaling
-#                 )
-                
-#                 pdf_paths.append(pdf_path)
-#                 print(f"PDF saved: {pdf_path}")
-                
-#             except Exception as e:
-#                 print(f"Error capturing {endpoint}: {str(e)}")
-#                 # Create a simple error PDF
-#                 pdf_path = os.path.join(output_dir, f"page_{i+1}_error.pdf")
-#                 # Use reportlab to create an error PDF
-#                 from reportlab.pdfgen import canvas
-#                 c = canvas.Canvas(pdf_path, pagesize=A4)
-#                 c.drawString(100, 500, f"Error: {str(e)}")
-#                 c.save()
-#                 pdf_paths.append(pdf_path)
-        
-#         await browser.close()
-    
-#     return pdf_paths
 
-@router.get("/Generate-pdf/{client_id}")
-async def generate_direct_pdf(request: Request, client_id: int, current_user: CurrentUser) -> Any:
+def _render_page_html(request: Request, renderer_func: Any, params: dict[str, Any]) -> str:
+    """Call a page endpoint and render its template response to HTML."""
+    response = renderer_func(request, **params)
+    if not (hasattr(response, "template") and hasattr(response, "context")):
+        raise ValueError("Not a template response")
+    return templates.get_template(response.template.name).render(**response.context)
+
+
+def _render_pages(
+    request: Request, renderers: list[tuple[int, Any, dict[str, Any]]]
+) -> tuple[list[int], list[str], set[int]]:
     """
-    Endpoint that renders templates directly to PDFs.
-    Uses in-memory rendering and Playwright to generate PDFs.
+    Render the given pages to HTML. A page whose template fails is replaced
+    by an error page and its number returned among the failed ones.
     """
-    with Session(db.engine) as session:
+    numbers = []
+    rendered_pages = []
+    failed = set()
+    for number, renderer_func, params in renderers:
+        try:
+            with stage_metrics.stage("template_render", str(number)):
+                rendered_pages.append(_render_page_html(request, renderer_func, params))
+        except Exception as e:
+            logger.error(f"Error rendering page {number}: {str(e)}")
+            rendered_pages.append(error_page_html(number, str(e)))
+            failed.add(number)
+        numbers.append(number)
+    return numbers, rendered_pages, failed
+
+
+async def _print_pages(
+    engine: PrintEngine, request: Request, renderers: list[tuple[int, Any, dict[str, Any]]]
+) -> list[PrintedPart]:
+    """
+    Render the given pages to HTML and print them.
+    The page endpoints query the database, so templates are rendered in a
+    worker thread rather than on the event loop.
+    """
+    numbers, rendered_pages, failed = await asyncio.to_thread(_render_pages, request, renderers)
+    return await engine.print_pages(numbers, rendered_pages, failed)
+
+
+@asynccontextmanager
+async def _contract_engine() -> AsyncIterator[PrintEngine]:
+    """
+    Engine that prints contract pages: the render worker processes, or
+    with PDF_RENDER_WORKERS set to 0 the browser pool in this process.
+    Pages listed in PDF_NATIVE_PAGES are printed without a browser.
+    """
+    if settings.PDF_RENDER_WORKERS > 0:
+        yield render_workers
+        return
+    async with BrowserEngine(browser_pool) as browser:
+        yield ContractEngine(browser, settings.PDF_NATIVE_PAGES)
+
+
+def _render_request(app: Any) -> Request:
+    """
+    Request used to render contract templates.
+    Static URLs built from it are answered by the renderer's asset route, so
+    the host is only a placeholder and contracts can be rendered outside of
+    an HTTP request.
+    """
+    return Request({
+        "type": "http",
+        "app": app,
+        "router": app.router,
+        "method": "GET",
+        "scheme": "http",
+        "server": ("contract.local", 80),
+        "path": "/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"contract.local")],
+    })
+
+
+def _load_contract(client_id: int) -> tuple[ClientInfo, ApartmentInfo]:
+    with stage_metrics.stage("db_load"), Session(db.engine) as session:
         client_info = session.exec(select(ClientInfo).where(ClientInfo.id == client_id)).first()
         if not client_info:
             raise HTTPException(status_code=404, detail="Client not found")
         apartment_info = session.exec(select(ApartmentInfo).where(ApartmentInfo.id == client_info.apt_id)).first()
         if not apartment_info:
             raise HTTPException(status_code=404, detail="Apartment not found")
-    # Create a temporary directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # List of functions and parameters to render each page
-        page_renderers = [
-            (read_pages, {"no": client_info.no, "apt_id": apartment_info.id}),
-            (read_page2, {"client_id": client_info.id}),
-            (read_page3, {"apt_id": apartment_info.id}),
-            (read_page4, {}),
-            (read_page5, {}),
-            (read_page6, {}),
-            (read_page7, {}),
-            (read_page8, {"apt_id": apartment_info.id}),
-            (read_page9, {"apt_id": apartment_info.id}),
-            (read_page10, {"apt_id": apartment_info.id})
-        ]
-        
-        # Generate HTML and PDFs for each page
-        pdf_paths = []
-        
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                viewport={"width": 1280, "height": 1696},
-                device_scale_factor=2.0,
-                ignore_https_errors=True
-            )
-            page = await context.new_page()
-            
-            for i, (renderer_func, params) in enumerate(page_renderers):
-                try:
-                    # Call the function that would normally render the template
-                    response = renderer_func(request, **params)
-                    
-                    # If the response is a TemplateResponse, get the rendered HTML
-                    if hasattr(response, "template") and hasattr(response, "context"):
-                        # Render the template to HTML
-                        rendered_html = templates.get_template(response.template.name).render(**response.context)
-                        
-                        # Add proper CSS for print
-                        html_with_css = f"""
-                        <!DOCTYPE html>
-                        <html>
-                        <head>
-                            <meta charset="UTF-8">
-                            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                            <style>
-                                @page {{
-                                    size: A4;
-                                    margin: 0;
-                                }}
-                                @media print {{
-                                    body {{
-                                        width: 210mm;
-                                        height: 297mm;
-                                        margin: 0;
-                                        padding: 0;
-                                    }}
-                                }}
-                                body {{
-                                    width: 210mm;
-                                    height: 297mm;
-                                    margin: 0;
-                                    padding: 0;
-                                }}
-                            </style>
-                        </head>
-                        <body>
-                        {rendered_html}
-                        </body>
-                        </html>
-                        """
-                        
-                        # Create a temporary HTML file
-                        html_path = os.path.join(temp_dir, f"page_{i+1}.html")
-                        with open(html_path, "w", encoding="utf-8") as f:
-                            f.write(html_with_css)
-                        
-                        # Navigate to the file
-                        await page.goto(f"file://{html_path}", wait_until="networkidle")
-                        
-                        # Wait for JavaScript rendering
-                        await asyncio.sleep(1)
-                        
-                        # Optimize for PDF print
-                        await page.evaluate("""() => {
-                            document.body.style.width = '210mm';
-                            document.body.style.height = '297mm';
-                            document.body.style.margin = '0';
-                            document.body.style.padding = '0';
-                            document.documentElement.style.width = '210mm';
-                            document.documentElement.style.height = '297mm';
-                            document.documentElement.style.margin = '0';
-                            document.documentElement.style.padding = '0';
-                        }""")
-                        
-                        # Generate PDF
-                        pdf_path = os.path.join(temp_dir, f"page_{i+1}.pdf")
-                        await page.pdf(
-                            path=pdf_path,
-                            format="A4",
-                            print_background=True,
-                            prefer_css_page_size=True,
-                            margin={"top": "0mm", "right": "0mm", "bottom": "0mm", "left": "0mm"},
-                            scale=1.0
-                        )
-                        
-                        pdf_paths.append(pdf_path)
-                        print(f"PDF saved: {pdf_path}")
-                    else:
-                        print(f"Skipping page {i+1}: Not a template response")
-                        
-                except Exception as e:
-                    print(f"Error rendering page {i+1}: {str(e)}")
-                    # Create a simple error PDF
-                    pdf_path = os.path.join(temp_dir, f"page_{i+1}_error.pdf")
-                    from reportlab.pdfgen import canvas
-                    c = canvas.Canvas(pdf_path, pagesize=A4)
-                    c.drawString(100, 500, f"Error rendering page {i+1}")
-                    c.drawString(100, 480, str(e))
-                    c.save()
-                    pdf_paths.append(pdf_path)
-            
-            await browser.close()
-        
-        # Combine all PDFs
-        if pdf_paths:
-            # Use PyPDF2 to merge PDFs
-            from PyPDF2 import PdfMerger
-            
-            merger = PdfMerger()
-            for pdf_path in pdf_paths:
-                if os.path.exists(pdf_path):
-                    merger.append(pdf_path)
-            
-            merged_path = os.path.join(temp_dir, "combined.pdf")
-            merger.write(merged_path)
-            merger.close()
-            
-            # Read the merged PDF
-            with open(merged_path, "rb") as f:
-                pdf_bytes = f.read()
-            
-            # Return the PDF as a streaming response
-            return StreamingResponse(
-                io.BytesIO(pdf_bytes),
-                media_type="application/pdf",
-                headers={"Content-Disposition": "attachment; filename=combined_pages.pdf"}
-            )
+    return client_info, apartment_info
+
+
+def _compile_templates() -> None:
+    for name in templates.env.list_templates(filter_func=lambda name: name.startswith("page/")):
+        templates.env.get_template(name)
+
+
+async def warm_up_contract_pipeline(app: Any) -> None:
+    """
+    Load everything the first contract would otherwise load lazily: compile
+    the page templates, preload static assets and fonts, start the render
+    workers (or the browser pool) and print the static pages into their
+    cache. The app only reports ready if the renderer started and printed.
+    """
+    async def start_renderer() -> None:
+        if settings.PDF_RENDER_WORKERS > 0:
+            await render_workers.start()
         else:
-            # Return an empty PDF if no pages were rendered
-            buffer = io.BytesIO()
-            c = canvas.Canvas(buffer, pagesize=A4)
-            c.drawString(100, 750, "No pages were rendered successfully")
-            c.save()
-            buffer.seek(0)
-            return StreamingResponse(
-                buffer,
-                media_type="application/pdf",
-                headers={"Content-Disposition": "attachment; filename=error.pdf"}
-            )
\ No newline at end of file
+            await browser_pool.start()
+
+    async def render() -> None:
+        async with _contract_engine() as engine:
+            parts = await _print_static_pages(engine, _render_request(app))
+        if any(part.failed for part in parts):
+            raise RuntimeError("The static contract pages did not print")
+
+    await pdf_warmup.run([
+        ("templates", lambda: asyncio.to_thread(_compile_templates)),
+        ("static_assets", lambda: asyncio.to_thread(static_assets.preload)),
+        ("fonts", lambda: asyncio.to_thread(native_engine.warm)),
+        ("renderer", start_renderer),
+        ("render", render),
+    ], required={"renderer", "render"})
+
+
+def _print_static_pages(engine: PrintEngine, request: Request) -> Awaitable[list[PrintedPart]]:
+    """Pages that take no data (4-7); printed once and spliced into every contract."""
+    static_renderers = [
+        (4, read_page4, {}),
+        (5, read_page5, {}),
+        (6, read_page6, {}),
+        (7, read_page7, {}),
+    ]
+    return static_pages.get_or_render("static", lambda: _print_pages(engine, request, static_renderers))
+
+
+async def _contract_parts(
+    app: Any, client_info: ClientInfo, apartment_info: ApartmentInfo
+) -> AsyncIterator[PrintedPart]:
+    """
+    Print a client's contract, yielding parts as they become available.
+    Static pages (4-7) are printed at startup, and again only after a
+    template change, and the floor plan annexes (8-9) once per apartment
+    type, so they usually come straight from memory;
+    the remaining pages are printed with Playwright, or natively when
+    listed in PDF_NATIVE_PAGES. A browser is only leased if a page needs one.
+    """
+    request = _render_request(app)
+
+    # Contract page numbers with the functions and parameters that render
+    # them; the static pages are printed by _print_static_pages
+    page_renderers = [
+        (1, read_pages, {"no": client_info.no, "apt_id": apartment_info.id}),
+        (2, read_page2, {"client_id": client_info.id}),
+        (3, read_page3, {"apt_id": apartment_info.id}),
+        (8, read_page8, {"apt_id": apartment_info.id}),
+        (9, read_page9, {"apt_id": apartment_info.id}),
+        (10, read_page10, {"apt_id": apartment_info.id})
+    ]
+    type_renderers = [r for r in page_renderers if r[0] in APARTMENT_TYPE_PAGE_NUMBERS]
+    live_renderers = [r for r in page_renderers if r[0] not in APARTMENT_TYPE_PAGE_NUMBERS]
+
+    async with _contract_engine() as engine:
+        for part in await _print_static_pages(engine, request):
+            yield part
+        for part in await apartment_type_pages.get_or_render(
+            apartment_info.apt_type, lambda: _print_pages(engine, request, type_renderers)
+        ):
+            yield part
+        for part in await _print_pages(engine, request, live_renderers):
+            yield part
+
+
+async def _stream_contract(
+    app: Any, client_info: ClientInfo, apartment_info: ApartmentInfo, cache_key: str, strict: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Print a client's contract and stream the merged PDF as parts finish,
+    so only one part is held in memory at a time. The stream is written to
+    the contract archive on the way through and kept unless a page failed;
+    with `strict`, a failed page also raises once the stream has ended.
+    """
+    entry = await asyncio.to_thread(contract_archive.writer, client_info.id, cache_key)
+    failed = False
+
+    async def parts() -> AsyncIterator[PrintedPart]:
+        nonlocal failed
+        async for part in _contract_parts(app, client_info, apartment_info):
+            failed = failed or part.failed
+            yield part
+
+    try:
+        async for chunk in stream_merged(parts(), optimize=settings.PDF_OPTIMIZE):
+            await asyncio.to_thread(entry.write, chunk)
+            yield chunk
+        # Contracts containing error pages are never archived. Committing
+        # may linearize the file; the response has already gone out, so
+        # repeat downloads get the linearized copy
+        if not failed:
+            await asyncio.to_thread(entry.commit)
+        elif strict:
+            raise RuntimeError("Some contract pages could not be printed")
+    finally:
+        await asyncio.to_thread(entry.close)
+
+
+async def render_client_contract(app: Any, client_id: int) -> bytes:
+    """
+    Contract PDF for a client, served from the contract archive when possible.
+    Raises if any page failed to print, so batches record the error instead
+    of a contract full of error pages.
+    """
+    archived = await archive_client_contract(app, client_id)
+    return await asyncio.to_thread(contract_archive.path(archived).read_bytes)
+
+
+async def archive_client_contract(app: Any, client_id: int) -> ContractVersion:
+    """Archive a client's contract, printing it unless an up-to-date version is archived."""
+    client_info, apartment_info = await asyncio.to_thread(_load_contract, client_id)
+    cache_key = await asyncio.to_thread(contract_cache_key, client_info, apartment_info)
+    if not settings.PDF_CACHE_ENABLED or not await asyncio.to_thread(
+        contract_archive.find, client_info.id, cache_key
+    ):
+        async with render_admission.admit(reject_when_full=False):
+            async for _ in _stream_contract(app, client_info, apartment_info, cache_key, strict=True):
+                pass
+    archived = await asyncio.to_thread(contract_archive.find, client_info.id, cache_key)
+    if not archived:
+        raise RuntimeError("The archived contract could not be found")
+    return archived
+
+
+def _contract_filename(client_id: int, version: int) -> str:
+    return f"contract_{client_id}_v{version}.pdf"
+
+
+@router.get("/Generate-pdf/{client_id}")
+async def generate_direct_pdf(request: Request, client_id: int, current_user: CurrentUser) -> Any:
+    """
+    Endpoint that renders templates directly to PDFs.
+    Reprints are answered from the contract archive, with ETag and Range
+    support; fresh prints are streamed to the client while the remaining
+    pages are still printing.
+    """
+    client_info, apartment_info = await asyncio.to_thread(_load_contract, client_id)
+
+    # Serve reprints from the contract archive
+    cache_key = await asyncio.to_thread(contract_cache_key, client_info, apartment_info)
+    if settings.PDF_CACHE_ENABLED:
+        archived = await asyncio.to_thread(contract_archive.find, client_info.id, cache_key)
+        if archived:
+            return await asyncio.to_thread(
+                archived_file_response,
+                request,
+                contract_archive.path(archived),
+                etag=f'"{archived.sha256}"',
+                filename=_contract_filename(client_info.id, archived.version),
+            )
+
+    # Reject before the response starts; the slot itself is taken and
+    # released by the stream
+    try:
+        render_admission.check()
+    except RenderQueueFull as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many contracts are being generated, please retry later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+    async def body() -> AsyncIterator[bytes]:
+        async with render_admission.admit(reject_when_full=False):
+            async for chunk in _stream_contract(request.app, client_info, apartment_info, cache_key):
+                yield chunk
+
+    return StreamingResponse(
+        stage_metrics.timed_stream(body(), stage="response_stream"),
+        media_type="application/pdf",
+        headers={"Content-Disposition": "attachment; filename=combined_pages.pdf"}
+    )
+
+
+@router.get("/Generate-pdf/{client_id}/versions", response_model=ContractVersionsPublic)
+def read_contract_versions(client_id: int, current_user: CurrentUser) -> Any:
+    """
+    Every archived contract version of a client, oldest first.
+    """
+    versions = contract_archive.versions(client_id)
+    return ContractVersionsPublic(
+        data=[ContractVersionPublic.model_validate(version) for version in versions],
+        count=len(versions)
+    )
+
+
+@router.get("/Generate-pdf/{client_id}/versions/{version}")
+def download_contract_version(
+    request: Request, client_id: int, version: int, current_user: CurrentUser
+) -> Any:
+    """
+    Download an archived contract version. Supports If-None-Match and
+    Range requests, so interrupted downloads can be resumed.
+    """
+    archived = contract_archive.get(client_id, version)
+    if not archived:
+        raise HTTPException(status_code=404, detail="Contract version not found")
+    return archived_file_response(
+        request,
+        contract_archive.path(archived),
+        etag=f'"{archived.sha256}"',
+        filename=_contract_filename(client_id, version),
+    )
+
+
+class ContractBatchRequest(SQLModel):
+    """Clients to print, either by id or by building and floor"""
+    client_ids: Optional[list[int]] = None
+    building: Optional[str] = None
+    floor: Optional[int] = None
+
+
+def _select_client_ids(query: Any) -> list[int]:
+    with Session(db.engine) as session:
+        return list(session.exec(query).all())
+
+
+@router.post("/Generate-pdf/batch")
+async def generate_pdf_batch(
+    request: Request, batch: ContractBatchRequest, current_user: CurrentUser
+) -> Any:
+    """
+    Render contracts for many clients and stream them back as a ZIP archive.
+    """
+    if batch.client_ids:
+        client_ids = list(dict.fromkeys(batch.client_ids))
+    elif batch.building is not None or batch.floor is not None:
+        query = select(ClientInfo.id).join(ApartmentInfo, ClientInfo.apt_id == ApartmentInfo.id)
+        if batch.building is not None:
+            query = query.where(ApartmentInfo.building == batch.building)
+        if batch.floor is not None:
+            query = query.where(ApartmentInfo.floor == batch.floor)
+        client_ids = await asyncio.to_thread(_select_client_ids, query.order_by(ClientInfo.id))
+    else:
+        raise HTTPException(status_code=400, detail="Provide client_ids or a building/floor filter")
+
+    if not client_ids:
+        raise HTTPException(status_code=404, detail="No clients found")
+
+    return StreamingResponse(
+        stream_contracts_zip(
+            client_ids,
+            partial(render_client_contract, request.app),
+            concurrency=settings.PDF_RENDER_WORKERS or settings.PDF_BROWSER_POOL_SIZE,
+        ),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=contracts.zip"}
+    )
+
+
+@router.get("/render-stats")
+def read_render_stats(current_user: CurrentUser) -> Any:
+    """
+    Get the PDF render queue depth, wait times and rejections.
+    """
+    return render_admission.stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def read_pdf_metrics(current_user: CurrentUser) -> Any:
+    """
+    Contract PDF pipeline metrics in the Prometheus text format.
+    Scrapers authenticate with a bearer token like any other client.
+    """
+    admission = "".join(
+        f"contract_pdf_admission_{key} {value}\n" for key, value in render_admission.stats().items()
+    )
+    return stage_metrics.render() + admission
+
+
+@router.post("/Generate-pdf/{client_id}/jobs", response_model=PdfJobPublic, status_code=202)
+async def create_pdf_job(client_id: int, current_user: CurrentUser) -> Any:
+    """
+    Queue a contract render in the background and return the job.
+    Poll the job status and download the PDF once it is done.
+    """
+    await asyncio.to_thread(_load_contract, client_id)
+    return await pdf_jobs.enqueue(client_id)
+
+
+@router.get("/pdf-jobs/{job_id}", response_model=PdfJobPublic)
+def read_pdf_job(job_id: str, current_user: CurrentUser) -> Any:
+    """
+    Get the status of a contract render job.
+    """
+    job = pdf_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="PDF job not found")
+    return job
+
+
+@router.get("/pdf-jobs/{job_id}/download")
+def download_pdf_job(request: Request, job_id: str, current_user: CurrentUser) -> Any:
+    """
+    Download the contract archived by a finished job.
+    """
+    job = pdf_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="PDF job not found")
+    if job.status != PdfJobStatus.done or job.version is None:
+        raise HTTPException(status_code=409, detail=f"PDF job is {job.status.value}")
+    archived = contract_archive.get(job.client_id, job.version)
+    if not archived:
+        raise HTTPException(status_code=410, detail="The contract of this PDF job is no longer archived")
+    return archived_file_response(
+        request,
+        contract_archive.path(archived),
+        etag=f'"{archived.sha256}"',
+        filename=_contract_filename(job.client_id, archived.version),
+    )
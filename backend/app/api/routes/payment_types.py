@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException
 from sqlmodel import func, select
 
 from app.api.deps import CurrentUser, SessionDep
+from app.core.writer import db_writer, delete_row, insert_row, update_row
 from app.models import (
     PaymentType,
     PaymentTypeCreate,
@@ -48,10 +49,7 @@ def create_payment_type(
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
         
-    payment_type = PaymentType.model_validate(payment_type_in)
-    session.add(payment_type)
-    session.commit()
-    session.refresh(payment_type)
+    payment_type = db_writer.submit(insert_row(PaymentType, payment_type_in))
     return payment_type
 
 
@@ -74,10 +72,9 @@ def update_payment_type(
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     update_dict = payment_type_in.model_dump(exclude_unset=True)
-    payment_type.sqlmodel_update(update_dict)
-    session.add(payment_type)
-    session.commit()
-    session.refresh(payment_type)
+    payment_type = db_writer.submit(update_row(PaymentType, id, update_dict))
+    if not payment_type:
+        raise HTTPException(status_code=404, detail="Payment type not found")
     return payment_type
 
 
@@ -93,6 +90,6 @@ def delete_payment_type(session: SessionDep, current_user: CurrentUser, id: int)
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    session.delete(payment_type)
-    session.commit()
+    if not db_writer.submit(delete_row(PaymentType, id)):
+        raise HTTPException(status_code=404, detail="Payment type not found")
     return Message(message="Payment type deleted successfully") 
\ No newline at end of file
@@ -3,7 +3,8 @@ from typing import Any
 from fastapi import APIRouter, HTTPException
 from sqlmodel import func, select
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, CurrentUser, SessionDep
+from app.core.writer import db_writer, delete_row, insert_row, update_row
 from app.models import (
     Payment,
     PaymentCreate,
@@ -16,35 +17,35 @@ router = APIRouter(prefix="/payments", tags=["payments"])
 
 
 @router.get("/", response_model=list[PaymentPublic])
-def read_payments(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_payments(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, skip: int = 0, limit: int = 100
 ) -> Any:
     """
     Retrieve payments.
     """
     statement = select(Payment).offset(skip).limit(limit)
-    payments = session.exec(statement).all()
+    payments = (await session.exec(statement)).all()
     return payments
 
 
 @router.get("/by-client/{client_id}", response_model=list[PaymentPublic])
-def read_payments_by_client(
-    session: SessionDep, current_user: CurrentUser, client_id: int
+async def read_payments_by_client(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, client_id: int
 ) -> Any:
     """
     Get payments by client ID.
     """
     statement = select(Payment).where(Payment.client_id == client_id)
-    payments = session.exec(statement).all()
+    payments = (await session.exec(statement)).all()
     return payments
 
 
 @router.get("/{id}", response_model=PaymentPublic)
-def read_payment(session: SessionDep, current_user: CurrentUser, id: int) -> Any:
+async def read_payment(session: AsyncSessionDep, current_user: AsyncCurrentUser, id: int) -> Any:
     """
     Get payment by ID.
     """
-    payment = session.get(Payment, id)
+    payment = await session.get(Payment, id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
     return payment
@@ -60,10 +61,7 @@ def create_payment(
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
         
-    payment = Payment.model_validate(payment_in)
-    session.add(payment)
-    session.commit()
-    session.refresh(payment)
+    payment = db_writer.submit(insert_row(Payment, payment_in))
     return payment
 
 
@@ -86,10 +84,9 @@ def update_payment(
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     update_dict = payment_in.model_dump(exclude_unset=True)
-    payment.sqlmodel_update(update_dict)
-    session.add(payment)
-    session.commit()
-    session.refresh(payment)
+    payment = db_writer.submit(update_row(Payment, id, update_dict))
+    if not payment:
+        raise HTTPException(status_code=404, detail="Payment not found")
     return payment
 
 
@@ -105,6 +102,6 @@ def delete_payment(session: SessionDep, current_user: CurrentUser, id: int) -> M
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    session.delete(payment)
-    session.commit()
+    if not db_writer.submit(delete_row(Payment, id)):
+        raise HTTPException(status_code=404, detail="Payment not found")
     return Message(message="Payment deleted successfully") 
\ No newline at end of file
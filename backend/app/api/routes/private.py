@@ -3,10 +3,11 @@ from typing import Any
 from fastapi import APIRouter
 from pydantic import BaseModel
 
-from app.api.deps import SessionDep
+from app import crud
 from app.core.security import get_password_hash
+from app.core.writer import db_writer
 from app.models import (
-    User,
+    UserCreate,
     UserPublic,
 )
 
@@ -21,18 +22,17 @@ class PrivateUserCreate(BaseModel):
 
 
 @router.post("/users/", response_model=UserPublic)
-def create_user(user_in: PrivateUserCreate, session: SessionDep) -> Any:
+def create_user(user_in: PrivateUserCreate) -> Any:
     """
     Create a new user.
     """
 
-    user = User(
-        email=user_in.email,
-        full_name=user_in.full_name,
-        hashed_password=get_password_hash(user_in.password),
+    user_create = UserCreate(email=user_in.email, password=user_in.password, full_name=user_in.full_name)
+    hashed_password = get_password_hash(user_create.password)
+    user = db_writer.submit(
+        lambda session: crud.create_user(
+            session=session, user_create=user_create, hashed_password=hashed_password
+        )
     )
 
-    session.add(user)
-    session.commit()
-
     return user
@@ -2,7 +2,7 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from sqlmodel import Session, col, delete, func, select
 
 from app import crud
 from app.api.deps import (
@@ -12,6 +12,7 @@ from app.api.deps import (
 )
 from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
+from app.core.writer import db_writer, delete_row
 from app.models import (
     Item,
     Message,
@@ -62,7 +63,13 @@ def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
             detail="The user with this email already exists in the system.",
         )
 
-    user = crud.create_user(session=session, user_create=user_in)
+    # Hashed before the writer is involved, so it is not held up by bcrypt
+    hashed_password = get_password_hash(user_in.password)
+    user = db_writer.submit(
+        lambda session: crud.create_user(
+            session=session, user_create=user_in, hashed_password=hashed_password
+        )
+    )
     if settings.emails_enabled and user_in.email:
         email_data = generate_new_account_email(
             email_to=user_in.email, username=user_in.email, password=user_in.password
@@ -89,18 +96,19 @@ def update_user_me(
             raise HTTPException(
                 status_code=409, detail="User with this email already exists"
             )
-    user_data = user_in.model_dump(exclude_unset=True)
-    current_user.sqlmodel_update(user_data)
-    session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
-    return current_user
+    user_update = UserUpdate.model_validate(user_in.model_dump(exclude_unset=True))
+    user = db_writer.submit(
+        lambda session: crud.update_user_by_id(
+            session=session, user_id=current_user.id, user_in=user_update
+        )
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
 
 @router.patch("/me/password", response_model=Message)
-def update_password_me(
-    *, session: SessionDep, body: UpdatePassword, current_user: CurrentUser
-) -> Any:
+def update_password_me(*, body: UpdatePassword, current_user: CurrentUser) -> Any:
     """
     Update own password.
     """
@@ -110,10 +118,16 @@ def update_password_me(
         raise HTTPException(
             status_code=400, detail="New password cannot be the same as the current one"
         )
+    user_update = UserUpdate(password=body.new_password)
     hashed_password = get_password_hash(body.new_password)
-    current_user.hashed_password = hashed_password
-    session.add(current_user)
-    session.commit()
+    db_writer.submit(
+        lambda session: crud.update_user_by_id(
+            session=session,
+            user_id=current_user.id,
+            user_in=user_update,
+            hashed_password=hashed_password,
+        )
+    )
     return Message(message="Password updated successfully")
 
 
@@ -126,7 +140,7 @@ def read_user_me(current_user: CurrentUser) -> Any:
 
 
 @router.delete("/me", response_model=Message)
-def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
+def delete_user_me(current_user: CurrentUser) -> Any:
     """
     Delete own user.
     """
@@ -134,8 +148,7 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    session.delete(current_user)
-    session.commit()
+    db_writer.submit(delete_row(User, current_user.id))
     return Message(message="User deleted successfully")
 
 
@@ -151,7 +164,12 @@ def register_user(session: SessionDep, user_in: UserRegister) -> Any:
             detail="The user with this email already exists in the system",
         )
     user_create = UserCreate.model_validate(user_in)
-    user = crud.create_user(session=session, user_create=user_create)
+    hashed_password = get_password_hash(user_create.password)
+    user = db_writer.submit(
+        lambda session: crud.create_user(
+            session=session, user_create=user_create, hashed_password=hashed_password
+        )
+    )
     return user
 
 
@@ -201,7 +219,17 @@ def update_user(
                 status_code=409, detail="User with this email already exists"
             )
 
-    db_user = crud.update_user(session=session, db_user=db_user, user_in=user_in)
+    hashed_password = get_password_hash(user_in.password) if user_in.password else None
+    db_user = db_writer.submit(
+        lambda session: crud.update_user_by_id(
+            session=session, user_id=user_id, user_in=user_in, hashed_password=hashed_password
+        )
+    )
+    if not db_user:
+        raise HTTPException(
+            status_code=404,
+            detail="The user with this id does not exist in the system",
+        )
     return db_user
 
 
@@ -219,8 +247,12 @@ def delete_user(
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
-    statement = delete(Item).where(col(Item.owner_id) == user_id)
-    session.exec(statement)  # type: ignore
-    session.delete(user)
-    session.commit()
+
+    def delete_with_items(session: Session) -> bool:
+        statement = delete(Item).where(col(Item.owner_id) == user_id)
+        session.exec(statement)  # type: ignore
+        return delete_row(User, user_id)(session)
+
+    if not db_writer.submit(delete_with_items):
+        raise HTTPException(status_code=404, detail="User not found")
     return Message(message="User deleted successfully")
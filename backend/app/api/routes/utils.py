@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
+from typing import Any
+
+from fastapi import APIRouter, Depends, Response
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
 from app.models import Message
+from app.pdf.warmup import pdf_warmup
 from app.utils import generate_test_email, send_email
 
 router = APIRouter(prefix="/utils", tags=["utils"])
@@ -29,3 +32,14 @@ def test_email(email_to: EmailStr) -> Message:
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
+
+
+@router.get("/ready/")
+async def readiness_check(response: Response) -> Any:
+    """
+    Ready once the contract PDF pipeline has warmed up and can print; 503
+    until then, or for good if its renderer failed to start.
+    """
+    if not (pdf_warmup.ready and pdf_warmup.healthy):
+        response.status_code = 503
+    return pdf_warmup.status()
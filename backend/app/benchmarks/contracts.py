@@ -0,0 +1,318 @@
+"""
+Load test contract generation through the HTTP API.
+
+Seeds a fresh SQLite database with clients and apartments, starts the API
+on it with uvicorn and requests /pages/Generate-pdf/{client_id} at the
+given concurrency. Reports, as JSON, latency percentiles, throughput, the
+server's peak resident memory (render workers included) and PDF sizes, so
+runs can be compared across changes to the pipeline.
+
+    python -m app.benchmarks.contracts --clients 50 --requests 200 --concurrency 4 --output before.json
+
+Settings for the server under test are passed with --env, e.g.
+--env PDF_NATIVE_PAGES='[1,2,3,10]'. Reprints are rendered again unless
+--reprints lets the contract archive answer them.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.config import settings
+from app.models import ApartmentInfo, ClientInfo, PaymentType
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+APARTMENT_TYPES = ["A1", "A2", "A3", "A4", "B1", "B2", "B3", "B4", "B5", "B6"]
+FIRST_NAMES = ["محمد", "أحمد", "علي", "حسين", "فاطمة", "زينب", "مريم", "عمر", "يوسف", "نور"]
+FAMILY_NAMES = ["العبيدي", "الجبوري", "التميمي", "الربيعي", "الساعدي", "الخفاجي", "الزبيدي", "الحسني"]
+DISTRICTS = ["الكرادة", "المنصور", "الأعظمية", "الكاظمية", "زيونة", "اليرموك"]
+JOBS = ["مهندس", "طبيب", "معلم", "محامي", "محاسب", "موظف"]
+KINSHIPS = ["زوج", "أخ", "أخت", "ابن", "والد"]
+
+
+def seed(path: Path, clients: int, rng: random.Random) -> list[int]:
+    """
+    Create a database at `path` with one client per apartment, spread over
+    buildings and floors, and return the client ids.
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        # The API only seeds its sample data into an empty database
+        session.add(PaymentType(name="Cash"))
+        apartments = []
+        for index in range(clients):
+            floor = index % 10 + 1
+            apartment = ApartmentInfo(
+                building=str(index // 40 + 1),
+                floor=floor,
+                apt_no=floor * 100 + index % 40 // 10 + 1,
+                area=rng.randint(80, 250),
+                meter_price=rng.randint(1000, 3000),
+                apt_type=rng.choice(APARTMENT_TYPES),
+            )
+            session.add(apartment)
+            apartments.append(apartment)
+        session.commit()
+
+        client_rows = []
+        for index, apartment in enumerate(apartments):
+            client = ClientInfo(
+                name=f"{rng.choice(FIRST_NAMES)} {rng.choice(FIRST_NAMES)} {rng.choice(FAMILY_NAMES)}",
+                id_no=rng.randint(100000000, 999999999),
+                issue_date=date(2024, 1, 1) - timedelta(days=rng.randint(1, 3000)),
+                no=index + 1,
+                m=str(rng.randint(900, 999)),
+                z=str(rng.randint(1, 60)),
+                d=rng.choice(DISTRICTS),
+                phone_number=f"077{rng.randint(10000000, 99999999)}",
+                registry_no=str(rng.randint(1000, 99999)),
+                newspaper_no=str(rng.randint(1, 500)),
+                job_title=rng.choice(JOBS),
+                alt_name=f"{rng.choice(FIRST_NAMES)} {rng.choice(FAMILY_NAMES)}",
+                alt_kinship=rng.choice(KINSHIPS),
+                alt_phone=f"078{rng.randint(10000000, 99999999)}",
+                alt_m=rng.randint(1, 5),
+                alt_z=rng.randint(1, 5),
+                alt_d=rng.randint(1, 5),
+                created_at=date(2025, 1, 1) + timedelta(days=index % 365),
+                apt_id=apartment.id,
+            )
+            session.add(client)
+            client_rows.append(client)
+        session.commit()
+        client_ids = [client.id for client in client_rows]
+    engine.dispose()
+    return client_ids
+
+
+def _process_tree_rss(pid: int) -> int:
+    """Resident memory in bytes of a process and all its descendants (Linux only)."""
+    children: dict[int, list[int]] = {}
+    for stat_path in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat_path.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat_path.parent.name))
+    total = 0
+    pending = [pid]
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    while pending:
+        current = pending.pop()
+        try:
+            total += int(Path(f"/proc/{current}/statm").read_text().split()[1]) * page_size
+        except OSError:
+            continue
+        pending += children.get(current, [])
+    return total
+
+
+async def _sample_rss(pid: int, peak: list[int], interval: float = 0.1) -> None:
+    while True:
+        peak[0] = max(peak[0], await asyncio.to_thread(_process_tree_rss, pid))
+        await asyncio.sleep(interval)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workdir: Path, port: int, reprints: bool, extra_env: dict[str, str]) -> subprocess.Popen[bytes]:
+    env = {
+        **os.environ,
+        "SQLITE_DB_NAME": str(workdir / "bench.db"),
+        "PDF_ARCHIVE_DIR": str(workdir / "contracts"),
+        "PDF_CACHE_DIR": str(workdir / "pdf"),
+        "PDF_CACHE_ENABLED": "true" if reprints else "false",
+        **extra_env,
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BASE_DIR,
+        env=env,
+    )
+
+
+async def _wait_until_up(client: httpx.AsyncClient, server: subprocess.Popen[bytes], timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            response = await client.get(f"{settings.API_V1_STR}/utils/ready/")
+        except httpx.TransportError:
+            response = None
+        if response is not None:
+            if response.status_code == 200:
+                return
+            status = response.json()
+            if status.get("ready") and not status.get("healthy"):
+                raise RuntimeError(f"Server cannot print contracts: {status['errors']}")
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not come up in time")
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def summarize(latencies: list[float], sizes: list[int], elapsed: float) -> dict[str, Any]:
+    if not latencies:
+        return {}
+    result: dict[str, Any] = {
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 1),
+            "p95": round(_percentile(latencies, 95) * 1000, 1),
+            "p99": round(_percentile(latencies, 99) * 1000, 1),
+            "mean": round(statistics.mean(latencies) * 1000, 1),
+            "max": round(max(latencies) * 1000, 1),
+        },
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+    }
+    if sizes:
+        result["pdf_bytes"] = {"mean": round(statistics.mean(sizes)), "min": min(sizes), "max": max(sizes)}
+    return result
+
+
+async def drive(
+    base_url: str,
+    server: subprocess.Popen[bytes],
+    client_ids: list[int],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> dict[str, Any]:
+    timeout = httpx.Timeout(settings.PDF_RENDER_WORKER_TIMEOUT * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        await _wait_until_up(client, server, timeout=120.0)
+        login = await client.post(
+            f"{settings.API_V1_STR}/login/access-token",
+            data={"username": settings.FIRST_SUPERUSER, "password": settings.FIRST_SUPERUSER_PASSWORD},
+        )
+        login.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+
+        async def generate(client_id: int) -> tuple[int, float, int]:
+            started = time.perf_counter()
+            response = await client.get(f"{settings.API_V1_STR}/pages/Generate-pdf/{client_id}")
+            return response.status_code, time.perf_counter() - started, len(response.content)
+
+        # Warm-up requests print the shared pages and are not counted
+        for client_id in client_ids[:warmup]:
+            await generate(client_id)
+
+        pending: asyncio.Queue[int] = asyncio.Queue()
+        for index in range(requests):
+            pending.put_nowait(client_ids[index % len(client_ids)])
+        latencies: list[float] = []
+        sizes: list[int] = []
+        statuses: Counter[int] = Counter()
+
+        async def worker() -> None:
+            while not pending.empty():
+                status, latency, size = await generate(pending.get_nowait())
+                statuses[status] += 1
+                if status == 200:
+                    latencies.append(latency)
+                    sizes.append(size)
+
+        peak_rss = [0]
+        sampler = asyncio.create_task(_sample_rss(server.pid, peak_rss))
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        finally:
+            sampler.cancel()
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "status_counts": {str(status): count for status, count in sorted(statuses.items())},
+        "elapsed_s": round(elapsed, 2),
+        **summarize(latencies, sizes, elapsed),
+        "peak_rss_mb": round(peak_rss[0] / (1024 * 1024), 1),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50, help="clients (and apartments) to seed")
+    parser.add_argument("--requests", type=int, default=100, help="timed contract downloads")
+    parser.add_argument("--concurrency", type=int, default=4, help="downloads in flight at once")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed downloads before measuring")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the generated data")
+    parser.add_argument("--reprints", action="store_true", help="let the contract archive answer reprints")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="setting for the server")
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    extra_env = dict(item.split("=", 1) for item in args.env)
+    with tempfile.TemporaryDirectory(prefix="contract-bench-") as tmp:
+        workdir = Path(tmp)
+        client_ids = seed(workdir / "bench.db", max(1, args.clients), random.Random(args.seed))
+        port = _free_port()
+        server = start_server(workdir, port, args.reprints, extra_env)
+        try:
+            results = asyncio.run(drive(
+                f"http://127.0.0.1:{port}", server, client_ids,
+                max(1, args.requests), max(1, args.concurrency), max(0, args.warmup),
+            ))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = {
+        "benchmark": "contracts",
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "clients": args.clients,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "reprints": args.reprints,
+            "env": extra_env,
+        },
+        "results": results,
+    }
+    encoded = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(encoded + "\n")
+    else:
+        print(encoded)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Compare the browser and native PDF engines on the text contract pages.
+
+Prints each page of one client's contract with both engines and reports,
+as JSON, the latency, size and page count per engine together with how
+closely the native output's text matches the browser's.
+
+    python -m app.benchmarks.engines --client-id 1 --runs 5
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import statistics
+import time
+import unicodedata
+from collections import Counter
+from typing import Any, Optional
+
+from PyPDF2 import PdfReader
+from sqlmodel import Session, select
+
+from app.api.routes import pages
+from app.core import db
+from app.main import app
+from app.models import ClientInfo
+from app.pdf.browser_pool import BrowserPool
+from app.pdf.engines import BrowserEngine, RenderEngine, native_engine
+
+DEFAULT_PAGES = [1, 2, 3, 10]
+
+
+def _page_html(client_id: int, number: int) -> str:
+    client_info, apartment_info = pages._load_contract(client_id)
+    renderers = {
+        1: (pages.read_pages, {"no": client_info.no, "apt_id": apartment_info.id}),
+        2: (pages.read_page2, {"client_id": client_info.id}),
+        3: (pages.read_page3, {"apt_id": apartment_info.id}),
+        10: (pages.read_page10, {"apt_id": apartment_info.id}),
+    }
+    if number not in renderers:
+        raise ValueError(f"Page {number} is not a text page")
+    renderer_func, params = renderers[number]
+    return pages._render_page_html(pages._render_request(app), renderer_func, params)
+
+
+def _pdf_text(pdf: bytes) -> str:
+    text = "".join(page.extract_text() or "" for page in PdfReader(io.BytesIO(pdf)).pages)
+    # Fold Arabic presentation forms back to plain letters
+    return unicodedata.normalize("NFKC", text)
+
+
+def text_overlap(reference: str, candidate: str) -> float:
+    """
+    Share of characters the two texts have in common, ignoring whitespace.
+    Order is ignored because engines extract right-to-left runs differently.
+    """
+    expected = Counter(char for char in reference if not char.isspace())
+    actual = Counter(char for char in candidate if not char.isspace())
+    total = max(sum(expected.values()), sum(actual.values()))
+    if not total:
+        return 1.0
+    return sum((expected & actual).values()) / total
+
+
+async def _measure(engine: RenderEngine, number: int, html: str, runs: int) -> dict[str, Any]:
+    timings = []
+    pdf = b""
+    for _ in range(runs):
+        started = time.perf_counter()
+        parts = await engine.print_pages([number], [html], set())
+        timings.append(time.perf_counter() - started)
+        if parts[0].failed:
+            return {"error": f"page {number} failed to print"}
+        pdf = parts[0].pdf
+    return {
+        "p50_ms": round(statistics.median(timings) * 1000, 1),
+        "mean_ms": round(statistics.mean(timings) * 1000, 1),
+        "min_ms": round(min(timings) * 1000, 1),
+        "bytes": len(pdf),
+        "pages": len(PdfReader(io.BytesIO(pdf)).pages),
+        "pdf": pdf,
+    }
+
+
+async def run(client_id: int, numbers: list[int], runs: int) -> dict[str, Any]:
+    pool = BrowserPool(size=1, lease_timeout=60.0)
+    results: dict[str, Any] = {"client_id": client_id, "runs": runs, "pages": {}}
+    try:
+        async with BrowserEngine(pool) as browser:
+            for number in numbers:
+                html = _page_html(client_id, number)
+                row: dict[str, Any] = {}
+                for engine in (browser, native_engine):
+                    # The first print warms fonts, the letterhead and the browser
+                    await engine.print_pages([number], [html], set())
+                    row[engine.name] = await _measure(engine, number, html, runs)
+
+                browser_pdf: Optional[bytes] = row["browser"].pop("pdf", None)
+                native_pdf: Optional[bytes] = row["native"].pop("pdf", None)
+                if browser_pdf and native_pdf:
+                    row["text_overlap"] = round(text_overlap(_pdf_text(browser_pdf), _pdf_text(native_pdf)), 3)
+                    row["speedup"] = round(row["browser"]["p50_ms"] / row["native"]["p50_ms"], 1)
+                results["pages"][str(number)] = row
+    finally:
+        await pool.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--client-id", type=int, help="client whose contract to print (default: the first)")
+    parser.add_argument("--pages", type=int, nargs="+", default=DEFAULT_PAGES, help="page numbers to print")
+    parser.add_argument("--runs", type=int, default=5, help="timed prints per page and engine")
+    args = parser.parse_args()
+
+    client_id = args.client_id
+    if client_id is None:
+        with Session(db.engine) as session:
+            client_id = session.exec(select(ClientInfo.id).order_by(ClientInfo.id)).first()
+        if client_id is None:
+            raise SystemExit("No clients in the database")
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(run(client_id, args.pages, max(1, args.runs)))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -53,6 +53,18 @@ class Settings(BaseSettings):
     
     # SQLite settings
     SQLITE_DB_NAME: str = "sql_app.db"
+    # Pragmas applied to every connection; WAL lets readers run alongside
+    # the writer, and NORMAL only syncs at checkpoints in WAL mode
+    SQLITE_JOURNAL_MODE: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    # Negative values are in KiB, positive ones in pages
+    SQLITE_CACHE_SIZE: int = -64 * 1024
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+    # Milliseconds a connection waits for a lock before "database is locked"
+    SQLITE_BUSY_TIMEOUT: int = 5000
+    # Most writes the single writer commits in one transaction
+    DB_WRITE_MAX_BATCH: int = 64
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -62,6 +74,51 @@ class Settings(BaseSettings):
         db_path = base_dir / self.SQLITE_DB_NAME
         return f"sqlite:///{db_path}"
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URI(self) -> str:
+        return self.SQLALCHEMY_DATABASE_URI.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+    # PDF rendering settings
+    # Pipeline metrics are served in the Prometheus format at
+    # {API_V1_STR}/pages/metrics to logged-in users only; a scraper sends
+    # `Authorization: Bearer <token>` with a token from /login/access-token,
+    # which has to be renewed every ACCESS_TOKEN_EXPIRE_MINUTES
+    PDF_BROWSER_POOL_SIZE: int = 2
+    PDF_BROWSER_LEASE_TIMEOUT: float = 30.0
+    PDF_BROWSER_WARM_ON_STARTUP: bool = True
+    # Compile templates, start the renderer and print the static contract
+    # pages into their cache before the app reports ready; when off, the
+    # first contract prints them
+    PDF_WARMUP_ON_STARTUP: bool = True
+    # Worker processes that print contracts, each with its own browser;
+    # 0 prints inside the API process with the browser pool
+    PDF_RENDER_WORKERS: int = 2
+    PDF_RENDER_WORKER_TIMEOUT: float = 120.0
+    PDF_SINGLE_PASS: bool = True
+    PDF_READY_TIMEOUT: float = 10.0
+    PDF_CACHE_ENABLED: bool = True
+    PDF_CACHE_DIR: str = "data/pdf"
+    PDF_ARCHIVE_DIR: str = "data/contracts"
+    # Older contract versions are pruned once the archive grows past this;
+    # every client's latest version is kept. 0 keeps everything
+    PDF_ARCHIVE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    PDF_RENDER_CONCURRENCY: int = 2
+    PDF_RENDER_MAX_WAITING: int = 8
+    PDF_JOB_WORKERS: int = 2
+    # Finished PDF jobs are forgotten after this many seconds
+    PDF_JOB_TTL: int = 24 * 60 * 60
+    PDF_IMAGE_VARIANTS: bool = True
+    PDF_IMAGE_DPI: int = 150
+    PDF_IMAGE_JPEG_QUALITY: int = 85
+    # Contract pages printed without a browser, e.g. [1, 2, 3, 10]
+    PDF_NATIVE_PAGES: list[int] = []
+    PDF_NATIVE_FONT: str = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+    PDF_NATIVE_FONT_BOLD: str = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+    PDF_OPTIMIZE: bool = True
+    # Linearize cached contracts for fast web view; needs the qpdf binary
+    PDF_LINEARIZE: bool = False
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
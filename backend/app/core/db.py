@@ -1,7 +1,12 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select, SQLModel
 
 from app import crud
 from app.core.config import settings
+from app.core.search import create_client_search
 from app.models import User, UserCreate
 
 # Create SQLite engine with check_same_thread=False to allow multi-threading
@@ -11,6 +16,24 @@ engine = create_engine(
 )
 
 
+@event.listens_for(engine, "connect")
+def apply_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Apply the SQLite tuning profile from settings to each new connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.execute(f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT)}")
+    cursor.close()
+
+
+# Async engine on aiosqlite for `async def` routes; same database and pragmas
+async_engine = create_async_engine(str(settings.SQLALCHEMY_ASYNC_DATABASE_URI))
+event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+
 # make sure all SQLModel models are imported (app.models) before initializing DB
 # otherwise, SQLModel might fail to initialize relationships properly
 # for more details: https://github.com/fastapi/full-stack-fastapi-template/issues/28
@@ -19,6 +42,8 @@ engine = create_engine(
 def init_db(session: Session) -> None:
     # Create tables directly with SQLModel
     SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        create_client_search(connection)
 
     user = session.exec(
         select(User).where(User.email == settings.FIRST_SUPERUSER)
@@ -30,3 +55,4 @@ def init_db(session: Session) -> None:
             is_superuser=True,
         )
         user = crud.create_user(session=session, user_create=user_in)
+        session.commit()
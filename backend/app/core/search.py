@@ -0,0 +1,102 @@
+import logging
+import re
+from typing import Optional
+
+from sqlalchemy import column, literal_column, table
+from sqlalchemy.engine import Connection
+from sqlmodel import select
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.models import ClientInfo
+
+logger = logging.getLogger(__name__)
+
+# Columns of client_info indexed for search, with their bm25 weights: a
+# match on the client's own name ranks above one on the alternate's
+SEARCH_COLUMNS = {
+    "name": 10.0,
+    "alt_name": 5.0,
+    "phone_number": 3.0,
+    "alt_phone": 2.0,
+    "registry_no": 1.0,
+    "newspaper_no": 1.0,
+}
+
+# FTS5 index over client_info that stores no copy of the text. The triggers
+# keep it in step with every insert, update and delete, whichever session or
+# engine makes them
+_columns = ", ".join(SEARCH_COLUMNS)
+_new_values = ", ".join(f"new.{name}" for name in SEARCH_COLUMNS)
+_old_values = ", ".join(f"old.{name}" for name in SEARCH_COLUMNS)
+_weights = ", ".join(str(weight) for weight in SEARCH_COLUMNS.values())
+CLIENT_SEARCH_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS client_search USING fts5(
+        {_columns},
+        content='client_info',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS client_search_insert AFTER INSERT ON client_info BEGIN
+        INSERT INTO client_search(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS client_search_delete AFTER DELETE ON client_info BEGIN
+        INSERT INTO client_search(client_search, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS client_search_update AFTER UPDATE ON client_info BEGIN
+        INSERT INTO client_search(client_search, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+        INSERT INTO client_search(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END
+    """,
+    # Persistent setting, so `rank` uses these weights in every query
+    f"INSERT INTO client_search(client_search, rank) VALUES ('rank', 'bm25({_weights})')",
+]
+
+client_search = table("client_search", column("rowid"), column("rank"))
+
+
+def create_client_search(connection: Connection) -> None:
+    """
+    Create the client search index and its triggers if they are missing,
+    indexing the clients already in the database.
+    """
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'client_search'"
+    ).first()
+    for statement in CLIENT_SEARCH_DDL:
+        connection.exec_driver_sql(statement)
+    if not exists:
+        connection.exec_driver_sql("INSERT INTO client_search(client_search) VALUES ('rebuild')")
+        logger.info("Built the client search index")
+
+
+def match_expression(query: str) -> Optional[str]:
+    """
+    FTS5 query matching clients with a word starting with each of the
+    words in `query`, or None if it has nothing to search for. Words are
+    quoted, so FTS5 syntax typed at the front desk is searched as text.
+    """
+    terms = [term.replace('"', "") for term in re.split(r"\s+", query.strip())]
+    terms = [term for term in terms if term]
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_statement(expression: str, skip: int = 0, limit: int = 20) -> SelectOfScalar[ClientInfo]:
+    """Clients matching an FTS5 expression, best match first."""
+    return (
+        select(ClientInfo)
+        .join(client_search, client_search.c.rowid == ClientInfo.id)
+        .where(literal_column("client_search").op("MATCH")(expression))
+        .order_by(client_search.c.rank)
+        .offset(skip)
+        .limit(limit)
+    )
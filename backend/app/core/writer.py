@@ -0,0 +1,161 @@
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Optional, TypeVar
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel
+
+from app.core.config import settings
+from app.core.db import engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+M = TypeVar("M", bound=SQLModel)
+
+
+@dataclass
+class _Write:
+    unit: Callable[[Session], Any]
+    future: Future[Any] = field(default_factory=Future)
+
+
+class WriteCoordinator:
+    """
+    Single writer for the SQLite database, with group commit.
+
+    Units of work are functions taking a Session; `submit` hands one to a
+    dedicated writer thread and blocks until it is committed, returning
+    whatever the unit returned. Units submitted while a commit is in
+    progress are run together in the next transaction, so concurrent
+    writers share one commit instead of queueing for SQLite's write lock.
+
+    If one unit in a batch fails, the batch is rolled back and its units
+    are retried one transaction each, so only that unit's caller sees the
+    error. Units may therefore run more than once and must only touch the
+    database. Objects are not expired on commit, so returned models can be
+    read after the writer's session has closed.
+
+    Every write made while serving requests goes through `db_writer`;
+    only startup (`init_db`, migrations) and the admin panel write on
+    their own connections.
+    """
+
+    def __init__(self, engine: Engine, max_batch: int) -> None:
+        self.engine = engine
+        self.max_batch = max(1, max_batch)
+        self.commits = 0
+        self.units = 0
+        self._queue: queue.Queue[Optional[_Write]] = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, unit: Callable[[Session], T]) -> T:
+        """Run a unit of work in the writer and return its result once committed."""
+        if self._thread is not None and threading.current_thread() is self._thread:
+            raise RuntimeError("Units of work cannot submit further writes")
+        self._start()
+        write = _Write(unit)
+        self._queue.put(write)
+        return write.future.result()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def close(self) -> None:
+        """Finish the queued writes and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            write = self._queue.get()
+            if write is None:
+                return
+            batch = [write]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    write = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if write is None:
+                    stop = True
+                    break
+                batch.append(write)
+            self._commit_batch([write for write in batch if write.future.set_running_or_notify_cancel()])
+            if stop:
+                return
+
+    def _execute(self, batch: list[_Write]) -> list[Any]:
+        with Session(self.engine, expire_on_commit=False) as session:
+            results = []
+            for write in batch:
+                results.append(write.unit(session))
+                # Flush per unit so a failing write is caught before the next runs
+                session.flush()
+            session.commit()
+        self.commits += 1
+        self.units += len(batch)
+        return results
+
+    def _commit_batch(self, batch: list[_Write]) -> None:
+        if not batch:
+            return
+        try:
+            results = self._execute(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].future.set_exception(e)
+                return
+            logger.info(f"Retrying a batch of {len(batch)} writes one by one after: {e}")
+            for write in batch:
+                self._commit_batch([write])
+            return
+        for write, result in zip(batch, results, strict=True):
+            write.future.set_result(result)
+
+
+def insert_row(model: type[M], data: Any, **extra: Any) -> Callable[[Session], M]:
+    """Unit of work creating a `model` row from `data`, with `extra` fields set on top."""
+    def unit(session: Session) -> M:
+        row = model.model_validate(data, update=extra)
+        session.add(row)
+        return row
+    return unit
+
+
+def update_row(model: type[M], id: Any, values: dict[str, Any]) -> Callable[[Session], Optional[M]]:
+    """Unit of work updating a row; returns None if the row no longer exists."""
+    def unit(session: Session) -> Optional[M]:
+        row = session.get(model, id)
+        if row is None:
+            return None
+        row.sqlmodel_update(values)
+        session.add(row)
+        return row
+    return unit
+
+
+def delete_row(model: type[SQLModel], id: Any) -> Callable[[Session], bool]:
+    """Unit of work deleting a row; returns whether it still existed."""
+    def unit(session: Session) -> bool:
+        row = session.get(model, id)
+        if row is None:
+            return False
+        session.delete(row)
+        return True
+    return unit
+
+
+db_writer = WriteCoordinator(engine, max_batch=settings.DB_WRITE_MAX_BATCH)
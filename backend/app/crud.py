@@ -1,5 +1,5 @@
 import uuid
-from typing import Any, Optional
+from typing import Optional
 
 from sqlmodel import Session, select
 
@@ -7,30 +7,55 @@ from app.core.security import get_password_hash, verify_password
 from app.models import Item, ItemCreate, User, UserCreate, UserUpdate
 
 
-def create_user(*, session: Session, user_create: UserCreate) -> User:
+def create_user(
+    *, session: Session, user_create: UserCreate, hashed_password: Optional[str] = None
+) -> User:
+    """
+    Add a user to the session without committing, so it can be submitted to
+    `db_writer` as a unit of work. Pass `hashed_password` to hash the
+    password beforehand rather than while holding the writer.
+    """
     db_obj = User.model_validate(
-        user_create, update={"hashed_password": get_password_hash(user_create.password)}
+        user_create,
+        update={"hashed_password": hashed_password or get_password_hash(user_create.password)},
     )
     session.add(db_obj)
-    session.commit()
-    session.refresh(db_obj)
+    session.flush()
     return db_obj
 
 
-def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
+def update_user(
+    *,
+    session: Session,
+    db_user: User,
+    user_in: UserUpdate,
+    hashed_password: Optional[str] = None,
+) -> User:
+    """Apply the fields set in `user_in` without committing, like `create_user`."""
     user_data = user_in.model_dump(exclude_unset=True)
     extra_data = {}
     if "password" in user_data:
-        password = user_data["password"]
-        hashed_password = get_password_hash(password)
-        extra_data["hashed_password"] = hashed_password
+        extra_data["hashed_password"] = hashed_password or get_password_hash(user_data["password"])
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    session.flush()
     return db_user
 
 
+def update_user_by_id(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    user_in: UserUpdate,
+    hashed_password: Optional[str] = None,
+) -> Optional[User]:
+    """`update_user` for a user loaded in `session`; None if it no longer exists."""
+    db_user = session.get(User, user_id)
+    if not db_user:
+        return None
+    return update_user(session=session, db_user=db_user, user_in=user_in, hashed_password=hashed_password)
+
+
 def get_user_by_email(*, session: Session, email: str) -> Optional[User]:
     statement = select(User).where(User.email == email)
     session_user = session.exec(statement).first()
@@ -49,6 +74,5 @@ def authenticate(*, session: Session, email: str, password: str) -> Optional[Use
 def create_item(*, session: Session, item_in: ItemCreate, owner_id: uuid.UUID) -> Item:
     db_item = Item.model_validate(item_in, update={"owner_id": owner_id})
     session.add(db_item)
-    session.commit()
-    session.refresh(db_item)
+    session.flush()
     return db_item
@@ -1,3 +1,5 @@
+from functools import partial
+
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
@@ -6,9 +8,16 @@ from starlette.middleware.cors import CORSMiddleware
 from starlette.responses import RedirectResponse
 
 from app.api.main import api_router
+from app.api.routes.pages import archive_client_contract, warm_up_contract_pipeline
 from app.core.config import settings
+from app.core.db import async_engine
+from app.core.writer import db_writer
 from app.admin import setup_admin
 from app.initial_data import init as init_data
+from app.pdf.browser_pool import browser_pool
+from app.pdf.jobs import pdf_jobs
+from app.pdf.warmup import pdf_warmup
+from app.pdf.workers import render_workers
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -48,6 +57,23 @@ setup_admin(app)
 async def startup_event():
     """Initialize the database on startup"""
     init_data()
+    if settings.PDF_WARMUP_ON_STARTUP:
+        # The app only starts serving, and reports ready, once warmed up
+        await warm_up_contract_pipeline(app)
+    else:
+        pdf_warmup.skip()
+    await pdf_jobs.start(partial(archive_client_contract, app))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop PDF job workers, render workers, the browser pool and the database on shutdown"""
+    await pdf_jobs.close()
+    await render_workers.close()
+    await browser_pool.close()
+    db_writer.close()
+    # Pooled aiosqlite connections belong to this event loop
+    await async_engine.dispose()
 
 
 @app.get("/", include_in_schema=False)
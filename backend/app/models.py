@@ -1,8 +1,10 @@
 import uuid
 from datetime import date, datetime
+from enum import Enum
 from typing import Union, List, Optional
 
 from pydantic import EmailStr
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -138,6 +140,7 @@ class ApartmentInfoUpdate(ApartmentInfoBase):
 
 class ApartmentInfo(ApartmentInfoBase, table=True):
     __tablename__ = "apartment_info"
+    __table_args__ = (Index("ix_apartment_info_building_floor_apt_no", "building", "floor", "apt_no"),)
     id: int = Field(default=None, primary_key=True, index=True)
     clients: List["ClientInfo"] = Relationship(back_populates="apartment")
 
@@ -166,7 +169,7 @@ class ClientInfoBase(SQLModel):
     alt_z: int
     alt_d: int
     created_at: date = Field(default=date.today())
-    apt_id: int = Field(foreign_key="apartment_info.id")
+    apt_id: int = Field(foreign_key="apartment_info.id", index=True)
 
 
 class ClientInfoCreate(ClientInfoBase):
@@ -231,10 +234,10 @@ class PaymentTypePublic(PaymentTypeBase):
 
 # Payment models
 class PaymentBase(SQLModel):
-    date_of_payment: datetime
-    payment_type_id: int = Field(foreign_key="payment_type.id")
+    date_of_payment: datetime = Field(index=True)
+    payment_type_id: int = Field(foreign_key="payment_type.id", index=True)
     amount: int
-    client_id: int = Field(foreign_key="client_info.id")
+    client_id: int = Field(foreign_key="client_info.id", index=True)
 
 
 class PaymentCreate(PaymentBase):
@@ -284,9 +287,9 @@ class HistoryTypePublic(HistoryTypeBase):
 
 # History models
 class HistoryBase(SQLModel):
-    type_id: int = Field(foreign_key="history_types.id")
+    type_id: int = Field(foreign_key="history_types.id", index=True)
     datetime: datetime
-    entity_id : int
+    entity_id : int = Field(index=True)
 
 
 class HistoryCreate(HistoryBase):
@@ -301,9 +304,64 @@ class HistoryUpdate(HistoryBase):
 
 class History(HistoryBase, table=True):
     __tablename__ = "history"
+    # Declared here because a Field() default on `datetime` would shadow the type
+    __table_args__ = (Index("ix_history_datetime", "datetime"),)
     id: int = Field(default=None, primary_key=True, index=True)
     history_type: HistoryType = Relationship(back_populates="histories")
 
 
 class HistoryPublic(HistoryBase):
     id: int
+
+
+# PDF job models
+class PdfJobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class PdfJobBase(SQLModel):
+    client_id: int
+    status: PdfJobStatus = PdfJobStatus.queued
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    # Archived contract version the job produced
+    version: Optional[int] = None
+
+
+class PdfJob(PdfJobBase, table=True):
+    __tablename__ = "pdf_jobs"
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+
+
+class PdfJobPublic(PdfJobBase):
+    id: str
+
+
+# Contract archive models
+class ContractVersionBase(SQLModel):
+    client_id: int = Field(index=True)
+    version: int
+    sha256: str
+    size: int
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ContractVersion(ContractVersionBase, table=True):
+    __tablename__ = "contract_versions"
+    __table_args__ = (UniqueConstraint("client_id", "version"),)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    # Hash of the inputs the contract was rendered from
+    input_key: str = Field(index=True)
+
+
+class ContractVersionPublic(ContractVersionBase):
+    id: int
+
+
+class ContractVersionsPublic(SQLModel):
+    data: List[ContractVersionPublic]
+    count: int
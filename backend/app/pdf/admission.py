@@ -0,0 +1,97 @@
+import asyncio
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from app.core.config import settings
+
+
+class RenderQueueFull(Exception):
+    """Raised when a render cannot even wait for a slot."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Too many contracts are being rendered")
+        self.retry_after = retry_after
+
+
+class RenderAdmission:
+    """
+    Admission control for PDF renders.
+
+    At most `limit` renders run at once. Interactive requests may wait in a
+    queue of `max_waiting`; beyond that they are rejected straight away
+    with an estimate of when to retry. Background work (jobs and batches)
+    still counts against the limit but always waits its turn.
+    """
+
+    # Weight of the newest sample in the moving averages
+    SMOOTHING = 0.2
+
+    def __init__(self, limit: int, max_waiting: int) -> None:
+        self.limit = max(1, limit)
+        self.max_waiting = max(0, max_waiting)
+        self._semaphore = asyncio.Semaphore(self.limit)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.avg_wait = 0.0
+        self.avg_render = 0.0
+
+    def _average(self, current: float, sample: float) -> float:
+        if not current:
+            return sample
+        return current + self.SMOOTHING * (sample - current)
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is expected to drain."""
+        per_render = self.avg_render or 10.0
+        return max(1, math.ceil(per_render * (self.waiting + 1) / self.limit))
+
+    def check(self) -> None:
+        """Raise RenderQueueFull if a render could not even wait for a slot."""
+        if self.active >= self.limit and self.waiting >= self.max_waiting:
+            self.rejected += 1
+            raise RenderQueueFull(self.retry_after())
+
+    @asynccontextmanager
+    async def admit(self, reject_when_full: bool = True) -> AsyncIterator[None]:
+        if reject_when_full:
+            self.check()
+
+        self.waiting += 1
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        started_at = time.perf_counter()
+        self.avg_wait = self._average(self.avg_wait, started_at - queued_at)
+        self.active += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+            self.avg_render = self._average(self.avg_render, time.perf_counter() - started_at)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "max_waiting": self.max_waiting,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.avg_wait * 1000),
+            "avg_render_ms": round(self.avg_render * 1000),
+        }
+
+
+render_admission = RenderAdmission(
+    limit=settings.PDF_RENDER_CONCURRENCY,
+    max_waiting=settings.PDF_RENDER_MAX_WAITING,
+)
@@ -0,0 +1,235 @@
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import and_
+from sqlmodel import Session, col, func, select
+
+from app.core import db
+from app.core.config import settings
+from app.core.writer import db_writer
+from app.models import ContractVersion
+from app.pdf.linearize import linearize
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Prune candidates loaded at a time, oldest first
+PRUNE_BATCH = 100
+
+
+def _total_size(session: Session) -> int:
+    """Bytes on disk; versions with identical contents share one file."""
+    files = (
+        select(ContractVersion.sha256, func.max(ContractVersion.size).label("size"))
+        .group_by(col(ContractVersion.sha256))
+        .subquery()
+    )
+    return int(session.exec(select(func.coalesce(func.sum(files.c.size), 0))).one())
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ContractArchive:
+    """
+    Persistent, content-addressed store of every contract rendered.
+
+    PDFs are kept on disk under the SHA-256 of their bytes, so identical
+    renders share one file, and the `contract_versions` table numbers each
+    client's distinct contracts 1, 2, 3... together with the hash of the
+    inputs they were rendered from. A reprint whose inputs are unchanged is
+    served from the archive instead of being rendered again.
+
+    Once the files grow past `max_bytes`, the oldest versions that are not
+    a client's latest are pruned; 0 disables pruning.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, version: ContractVersion) -> Path:
+        return self.directory / version.sha256[:2] / f"{version.sha256}.pdf"
+
+    def _available(self, version: Optional[ContractVersion]) -> Optional[ContractVersion]:
+        if version is None or not self.path(version).is_file():
+            return None
+        return version
+
+    def find(self, client_id: int, input_key: str) -> Optional[ContractVersion]:
+        """Latest archived contract for a client rendered from these inputs."""
+        with Session(db.engine) as session:
+            version = session.exec(
+                select(ContractVersion)
+                .where(ContractVersion.client_id == client_id, ContractVersion.input_key == input_key)
+                .order_by(col(ContractVersion.version).desc())
+            ).first()
+        return self._available(version)
+
+    def get(self, client_id: int, version_number: int) -> Optional[ContractVersion]:
+        with Session(db.engine) as session:
+            version = session.exec(
+                select(ContractVersion)
+                .where(ContractVersion.client_id == client_id, ContractVersion.version == version_number)
+            ).first()
+        return self._available(version)
+
+    def versions(self, client_id: int) -> list[ContractVersion]:
+        with Session(db.engine) as session:
+            return list(session.exec(
+                select(ContractVersion)
+                .where(ContractVersion.client_id == client_id)
+                .order_by(col(ContractVersion.version))
+            ).all())
+
+    def prune(self) -> int:
+        """Delete old versions until the archive fits its budget; returns the bytes freed."""
+        if self.max_bytes <= 0:
+            return 0
+        # Checked on a reader connection so the writer is only held up
+        # when there is something to prune
+        with Session(db.engine) as session:
+            if _total_size(session) <= self.max_bytes:
+                return 0
+        unlinked = db_writer.submit(self._prune_versions)
+        for version in unlinked:
+            self.path(version).unlink(missing_ok=True)
+        freed = sum(version.size for version in unlinked)
+        if freed:
+            logger.info(f"Pruned {len(unlinked)} archived contract(s), freeing {freed} bytes")
+        return freed
+
+    def _prune_versions(self, session: Session) -> list[ContractVersion]:
+        # Unit of work for the writer; returns the versions whose file can go
+        total = _total_size(session)
+        latest = (
+            select(ContractVersion.client_id, func.max(ContractVersion.version).label("version"))
+            .group_by(col(ContractVersion.client_id))
+            .subquery()
+        )
+        kept = select(ContractVersion.sha256).join(
+            latest,
+            and_(col(ContractVersion.client_id) == latest.c.client_id, col(ContractVersion.version) == latest.c.version),
+        )
+        candidates = (
+            select(ContractVersion)
+            .where(col(ContractVersion.sha256).not_in(kept))
+            .order_by(col(ContractVersion.created_at), col(ContractVersion.id))
+            .limit(PRUNE_BATCH)
+        )
+        unlinked: list[ContractVersion] = []
+        while total > self.max_bytes:
+            versions = session.exec(candidates).all()
+            if not versions:
+                break
+            references = dict(session.exec(
+                select(ContractVersion.sha256, func.count())
+                .where(col(ContractVersion.sha256).in_({version.sha256 for version in versions}))
+                .group_by(col(ContractVersion.sha256))
+            ).all())
+            for version in versions:
+                if total <= self.max_bytes:
+                    break
+                session.delete(version)
+                references[version.sha256] -= 1
+                # Identical renders share a file; it goes with its last version
+                if not references[version.sha256]:
+                    unlinked.append(version)
+                    total -= version.size
+            session.flush()
+        return unlinked
+
+    def writer(self, client_id: int, input_key: str) -> "ArchiveWriter":
+        """Start archiving a contract that is written piece by piece."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return ArchiveWriter(self, client_id, input_key)
+
+    def _record(self, client_id: int, input_key: str, sha256: str, size: int) -> ContractVersion:
+        def record(session: Session) -> ContractVersion:
+            # Writes are serialized by the writer, so two renders of the
+            # same client cannot race for the next version number
+            latest = session.exec(
+                select(ContractVersion)
+                .where(ContractVersion.client_id == client_id)
+                .order_by(col(ContractVersion.version).desc())
+            ).first()
+            if latest and latest.sha256 == sha256:
+                # Same bytes as the latest version, e.g. after an asset
+                # change that did not alter the output: keep its number
+                # and let reprints with these inputs find it
+                if latest.input_key != input_key:
+                    latest.input_key = input_key
+                    session.add(latest)
+                return latest
+            version = ContractVersion(
+                client_id=client_id,
+                version=(latest.version if latest else 0) + 1,
+                input_key=input_key,
+                sha256=sha256,
+                size=size,
+            )
+            session.add(version)
+            return version
+
+        version = db_writer.submit(record)
+        logger.info(f"Archived contract version {version.version} for client {client_id}")
+        return version
+
+
+class ArchiveWriter:
+    """
+    A contract being written to a temporary file in the archive.
+    It is only archived once committed; closing it uncommitted discards
+    what was written.
+    """
+
+    def __init__(self, archive: ContractArchive, client_id: int, input_key: str) -> None:
+        self.archive = archive
+        self.client_id = client_id
+        self.input_key = input_key
+        self._digest = hashlib.sha256()
+        self._size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=archive.directory, suffix=".tmp")
+        self._tmp_path = Path(tmp_path)
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._digest.update(data)
+        self._size += len(data)
+
+    def commit(self) -> ContractVersion:
+        """Move the file to its content address and record the version."""
+        self._file.close()
+        sha256 = self._digest.hexdigest()
+        if settings.PDF_LINEARIZE and linearize(self._tmp_path):
+            sha256 = _file_sha256(self._tmp_path)
+            self._size = self._tmp_path.stat().st_size
+
+        path = self.archive.directory / sha256[:2] / f"{sha256}.pdf"
+        if path.exists():
+            self._tmp_path.unlink()
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self._tmp_path, path)
+        version = self.archive._record(self.client_id, self.input_key, sha256, self._size)
+        self.archive.prune()
+        return version
+
+    def close(self) -> None:
+        self._file.close()
+        # Gone already once committed
+        self._tmp_path.unlink(missing_ok=True)
+
+
+contract_archive = ContractArchive(BASE_DIR / settings.PDF_ARCHIVE_DIR, settings.PDF_ARCHIVE_MAX_BYTES)
@@ -0,0 +1,85 @@
+import logging
+import mimetypes
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+from playwright.async_api import Route
+
+from app.pdf.images import image_variants
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+
+# URLs produced by request.url_for('static', ...) in the contract templates
+STATIC_ROUTE = "**/static/**"
+
+
+@dataclass
+class StaticAsset:
+    body: bytes
+    content_type: str
+    mtime_ns: int
+
+
+class StaticAssets:
+    """
+    Byte cache of app/static served to the PDF renderer.
+
+    Files are read once and kept in memory; each lookup only stats the file
+    so an edited asset is reloaded on its next use. Images are served as
+    their print-sized variants, so templates pick them up automatically.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory.resolve()
+        self._assets: dict[str, StaticAsset] = {}
+
+    def preload(self) -> None:
+        count = 0
+        for path in self.directory.rglob("*"):
+            if path.is_file():
+                self.get(path.relative_to(self.directory).as_posix())
+                count += 1
+        logger.info(f"Preloaded {count} static assets for PDF rendering")
+
+    def get(self, relative_path: str) -> Optional[StaticAsset]:
+        path = (self.directory / relative_path).resolve()
+        if not path.is_relative_to(self.directory):
+            return None
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except (FileNotFoundError, NotADirectoryError):
+            self._assets.pop(relative_path, None)
+            return None
+        asset = self._assets.get(relative_path)
+        if asset is None or asset.mtime_ns != mtime_ns:
+            content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            body = path.read_bytes()
+            # Images are swapped for their print-sized variant
+            body = image_variants.get(relative_path, body) or body
+            asset = StaticAsset(body=body, content_type=content_type, mtime_ns=mtime_ns)
+            self._assets[relative_path] = asset
+        return asset
+
+    def resolve_url(self, url: str) -> Optional[StaticAsset]:
+        """Look up the asset behind a /static/... URL."""
+        path = unquote(urlsplit(url).path)
+        _, marker, relative_path = path.partition("/static/")
+        if not marker:
+            return None
+        return self.get(relative_path)
+
+
+static_assets = StaticAssets(STATIC_DIR)
+
+
+async def serve_static_asset(route: Route) -> None:
+    """Playwright route handler answering static URLs from memory."""
+    asset = static_assets.resolve_url(route.request.url)
+    if asset is None:
+        await route.fulfill(status=404, body="Not Found")
+        return
+    await route.fulfill(status=200, body=asset.body, content_type=asset.content_type)
@@ -0,0 +1,79 @@
+import asyncio
+import io
+import logging
+import zipfile
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Unseekable sink that hands written ZIP bytes back in chunks."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: bytes) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_contracts_zip(
+    client_ids: list[int],
+    render: Callable[[int], Awaitable[bytes]],
+    concurrency: int,
+) -> AsyncIterator[bytes]:
+    """
+    Render contracts concurrently and stream them as a ZIP archive.
+
+    Each PDF is written to the archive as soon as it finishes, in completion
+    order. At most `concurrency` renders run at once and finished PDFs wait
+    in a queue of the same size, so memory use does not grow with the batch.
+    A contract that fails is replaced by a text file with the error.
+    """
+    pending: asyncio.Queue[int] = asyncio.Queue()
+    for client_id in client_ids:
+        pending.put_nowait(client_id)
+    finished: asyncio.Queue[tuple[int, Optional[bytes], Optional[str]]] = asyncio.Queue(
+        maxsize=max(1, concurrency)
+    )
+
+    async def worker() -> None:
+        while True:
+            try:
+                client_id = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                pdf_bytes = await render(client_id)
+            except Exception as e:
+                logger.error(f"Error rendering contract for client {client_id}: {str(e)}")
+                await finished.put((client_id, None, getattr(e, "detail", None) or str(e)))
+            else:
+                await finished.put((client_id, pdf_bytes, None))
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    buffer = _ChunkBuffer()
+    try:
+        with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            for _ in client_ids:
+                client_id, pdf_bytes, error = await finished.get()
+                if pdf_bytes is not None:
+                    archive.writestr(f"contract_{client_id}.pdf", pdf_bytes)
+                else:
+                    archive.writestr(f"contract_{client_id}_error.txt", error or "Unknown error")
+                yield buffer.drain()
+        yield buffer.drain()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+from playwright.async_api import Error as PlaywrightError
+
+from app.core.config import settings
+from app.pdf.assets import STATIC_ROUTE, serve_static_asset
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BrowserSlot:
+    """A warm browser with one context and page ready to print."""
+    index: int
+    browser: Browser
+    context: BrowserContext
+    page: Page
+    healthy: bool = True
+
+    def is_alive(self) -> bool:
+        return self.healthy and self.browser.is_connected() and not self.page.is_closed()
+
+
+class BrowserPool:
+    """
+    Fixed-size pool of Chromium browsers shared by all PDF renders.
+
+    Each slot owns one browser, one context and one page. Requests lease a
+    slot, print with its page and hand it back. Slots whose browser crashed
+    or disconnected are relaunched before they are leased again.
+    """
+
+    def __init__(self, size: int, lease_timeout: float) -> None:
+        self.size = max(1, size)
+        self.lease_timeout = lease_timeout
+        self._playwright: Optional[Playwright] = None
+        self._idle: Optional[asyncio.Queue[BrowserSlot]] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def started(self) -> bool:
+        return self._idle is not None
+
+    async def start(self) -> None:
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.started:
+                return
+            self._playwright = await async_playwright().start()
+            idle: asyncio.Queue[BrowserSlot] = asyncio.Queue()
+            try:
+                for index in range(self.size):
+                    idle.put_nowait(await self._launch(index))
+            except BaseException:
+                while not idle.empty():
+                    await self._dispose(idle.get_nowait())
+                await self._playwright.stop()
+                self._playwright = None
+                raise
+            self._idle = idle
+            logger.info(f"Browser pool started with {self.size} browser(s)")
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, None
+        if idle is not None:
+            while not idle.empty():
+                await self._dispose(idle.get_nowait())
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._start_lock = None
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Page]:
+        """Borrow a healthy page for the duration of one render."""
+        if not self.started:
+            await self.start()
+        assert self._idle is not None
+        idle = self._idle
+        try:
+            slot = await asyncio.wait_for(idle.get(), timeout=self.lease_timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError("Timed out waiting for a free browser")
+        try:
+            if not slot.is_alive():
+                slot = await self._relaunch(slot)
+            yield slot.page
+        except PlaywrightError:
+            slot.healthy = False
+            raise
+        finally:
+            if idle is self._idle:
+                idle.put_nowait(slot)
+            else:
+                # The pool was closed while this slot was leased
+                await self._dispose(slot)
+
+    async def _launch(self, index: int) -> BrowserSlot:
+        assert self._playwright is not None
+        browser = await self._playwright.chromium.launch(headless=True)
+        context = await browser.new_context(
+            viewport={"width": 1280, "height": 1696},
+            device_scale_factor=2.0,
+            ignore_https_errors=True
+        )
+        # Static assets are answered in-process instead of looping back
+        # through the API server
+        await context.route(STATIC_ROUTE, serve_static_asset)
+        page = await context.new_page()
+        slot = BrowserSlot(index=index, browser=browser, context=context, page=page)
+        browser.on("disconnected", lambda _: self._mark_unhealthy(slot))
+        page.on("crash", lambda _: self._mark_unhealthy(slot))
+        return slot
+
+    async def _relaunch(self, slot: BrowserSlot) -> BrowserSlot:
+        logger.warning(f"Relaunching browser {slot.index} after a crash")
+        await self._dispose(slot)
+        return await self._launch(slot.index)
+
+    async def _dispose(self, slot: BrowserSlot) -> None:
+        try:
+            await slot.browser.close()
+        except PlaywrightError:
+            pass
+
+    @staticmethod
+    def _mark_unhealthy(slot: BrowserSlot) -> None:
+        slot.healthy = False
+
+
+browser_pool = BrowserPool(
+    size=settings.PDF_BROWSER_POOL_SIZE,
+    lease_timeout=settings.PDF_BROWSER_LEASE_TIMEOUT,
+)
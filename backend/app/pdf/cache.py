@@ -0,0 +1,67 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.models import ApartmentInfo, ClientInfo
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+APP_DIR = BASE_DIR / "app"
+
+# Bump when the rendering pipeline changes in a way that alters the output
+PIPELINE_VERSION = 2
+
+# Fields the contract templates read from each model
+CLIENT_FIELDS = (
+    "id", "no", "created_at", "name", "id_no", "registry_no", "newspaper_no",
+    "issue_date", "m", "z", "d", "phone_number", "job_title", "alt_name",
+    "alt_kinship", "alt_phone",
+)
+APARTMENT_FIELDS = ("id", "building", "floor", "apt_no", "apt_type", "area", "meter_price")
+
+
+# Path -> (size, mtime, SHA-256 of the contents)
+_file_hashes: dict[Path, tuple[int, int, str]] = {}
+
+
+def _file_hash(path: Path) -> str:
+    stat = path.stat()
+    cached = _file_hashes.get(path)
+    if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[2]
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    _file_hashes[path] = (stat.st_size, stat.st_mtime_ns, digest)
+    return digest
+
+
+def asset_fingerprint() -> str:
+    """
+    Fingerprint of every template and static asset the contract depends on.
+
+    Built from file names and content hashes, so a fresh checkout or image
+    build with the same files gives the same fingerprint. Each file is only
+    hashed again when its size or modification time changes.
+    """
+    digest = hashlib.sha256()
+    for root in (APP_DIR / "templates", APP_DIR / "static"):
+        for path in sorted(root.rglob("*")):
+            if path.is_file():
+                digest.update(f"{path.relative_to(APP_DIR)}:{_file_hash(path)}\n".encode())
+    return digest.hexdigest()
+
+
+def contract_cache_key(client: ClientInfo, apartment: ApartmentInfo) -> str:
+    """Hash of everything that determines the bytes of a client's contract."""
+    payload: dict[str, Any] = {
+        "version": PIPELINE_VERSION,
+        "single_pass": settings.PDF_SINGLE_PASS,
+        "native_pages": sorted(settings.PDF_NATIVE_PAGES),
+        "output": [settings.PDF_OPTIMIZE, settings.PDF_LINEARIZE],
+        "images": [settings.PDF_IMAGE_VARIANTS, settings.PDF_IMAGE_DPI, settings.PDF_IMAGE_JPEG_QUALITY],
+        "client": {field: getattr(client, field) for field in CLIENT_FIELDS},
+        "apartment": {field: getattr(apartment, field) for field in APARTMENT_FIELDS},
+        "assets": asset_fingerprint(),
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
@@ -0,0 +1,89 @@
+from html import escape
+
+import lxml.html
+
+PRINT_CSS = """
+@page {
+    size: A4;
+    margin: 0;
+}
+html, body {
+    margin: 0;
+    padding: 0;
+}
+.contract-page {
+    width: 210mm;
+    height: 297mm;
+    margin: 0;
+    padding: 0;
+    overflow: hidden;
+    break-after: page;
+}
+.contract-page:last-child {
+    break-after: auto;
+}
+"""
+
+
+def build_contract_document(pages: list[str]) -> str:
+    """
+    Combine rendered page templates into one printable HTML document.
+
+    Every page becomes an A4 section followed by a page break. Linked
+    stylesheets are hoisted into the shared head once, and each page's
+    inline <style> blocks are wrapped in @scope so rules such as
+    `img { width: 500px }` only apply to the page that declared them.
+    """
+    stylesheets: list[str] = []
+    scoped_styles: list[str] = []
+    sections: list[str] = []
+
+    for number, page_html in enumerate(pages, start=1):
+        section_id = f"contract-page-{number}"
+        doc = lxml.html.document_fromstring(page_html)
+
+        for link in list(doc.iter("link")):
+            href = link.get("href")
+            if (link.get("rel") or "").lower() == "stylesheet" and href and href not in stylesheets:
+                stylesheets.append(href)
+            link.drop_tree()
+
+        for style in list(doc.iter("style")):
+            if style.text and style.text.strip():
+                scoped_styles.append(f"@scope (#{section_id}) {{\n{style.text}\n}}")
+            style.drop_tree()
+
+        body = doc.find("body")
+        parts = [escape(body.text)] if body is not None and body.text else []
+        if body is not None:
+            parts.extend(lxml.html.tostring(child, encoding="unicode") for child in body)
+        sections.append(f'<section class="contract-page" id="{section_id}">{"".join(parts)}</section>')
+
+    links = "\n".join(f'<link rel="stylesheet" href="{escape(href)}">' for href in stylesheets)
+    styles = "\n".join(scoped_styles)
+    body_html = "\n".join(sections)
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+{links}
+<style>{PRINT_CSS}</style>
+<style>
+{styles}
+</style>
+</head>
+<body>
+{body_html}
+</body>
+</html>
+"""
+
+
+def error_page_html(number: int, message: str) -> str:
+    """Placeholder page printed in place of a template that failed to render."""
+    return (
+        "<html><body><div class=\"a4-page\"><div class=\"content\">"
+        f"<p>Error rendering page {number}</p><p>{escape(message)}</p>"
+        "</div></div></body></html>"
+    )
@@ -0,0 +1,246 @@
+import asyncio
+import base64
+import io
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Collection
+from contextlib import AsyncExitStack
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+import lxml.html
+from PIL import Image
+from playwright.async_api import Page
+from reportlab.lib.fonts import addMapping
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from xhtml2pdf import pisa
+from xhtml2pdf.default import DEFAULT_FONT
+
+from app.core.config import settings
+from app.pdf.assets import STATIC_DIR, static_assets
+from app.pdf.browser_pool import BrowserPool
+from app.pdf.document import build_contract_document
+from app.pdf.merge import PrintedPart, error_pdf
+from app.pdf.metrics import stage_metrics
+from app.pdf.renderer import print_document
+
+logger = logging.getLogger(__name__)
+
+# Font family name the native stylesheet refers to
+NATIVE_FONT = "contract"
+NATIVE_STYLESHEET = "css/native.css"
+# Background of .a4-page in base.css, the @page background in native.css
+LETTERHEAD = "Picture1.png"
+
+
+class PrintEngine(ABC):
+    """Prints rendered contract pages to PDF parts."""
+
+    name = "engine"
+
+    @abstractmethod
+    async def print_pages(
+        self, numbers: list[int], pages: list[str], failed: set[int]
+    ) -> list[PrintedPart]:
+        """Print pages, where `failed` holds the numbers whose template errored."""
+
+
+class RenderEngine(PrintEngine):
+    """
+    Prints rendered contract pages in print passes.
+
+    Subclasses decide how pages are grouped into print passes and how a
+    pass is printed; a pass that fails becomes an error page in place of
+    the pages it covered.
+    """
+
+    def _groups(self, numbers: list[int], pages: list[str]) -> list[tuple[list[int], list[str]]]:
+        return [([number], [html]) for number, html in zip(numbers, pages, strict=True)]
+
+    @abstractmethod
+    async def _print(self, pages: list[str], name: str) -> bytes:
+        """Print one pass of pages to a PDF."""
+
+    async def print_pages(
+        self, numbers: list[int], pages: list[str], failed: set[int]
+    ) -> list[PrintedPart]:
+        parts = []
+        for group_numbers, group_pages in self._groups(numbers, pages):
+            name = "_".join(str(number) for number in group_numbers)
+            try:
+                pdf = await self._print(group_pages, name)
+                parts.append(PrintedPart(group_numbers, pdf, failed=bool(failed.intersection(group_numbers))))
+            except Exception as e:
+                logger.error(f"Error printing pages {name} with the {self.name} engine: {str(e)}")
+                parts.append(PrintedPart(group_numbers, error_pdf([f"Error printing pages {name}", str(e)]), failed=True))
+        return parts
+
+
+class BrowserEngine(RenderEngine):
+    """
+    Prints pages with a Chromium page leased from the browser pool.
+
+    The lease is taken on the first print and held until the engine is
+    closed, so a contract whose pages are all cached or printed natively
+    never waits for a browser. Use it as an async context manager.
+    """
+
+    name = "browser"
+
+    def __init__(self, pool: BrowserPool) -> None:
+        self.pool = pool
+        self._stack = AsyncExitStack()
+        self._page: Optional[Page] = None
+
+    async def __aenter__(self) -> "BrowserEngine":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self._stack.aclose()
+        self._page = None
+
+    async def _lease(self) -> Page:
+        if self._page is None:
+            acquire_started = time.perf_counter()
+            self._page = await self._stack.enter_async_context(self.pool.lease())
+            stage_metrics.observe("browser_acquire", time.perf_counter() - acquire_started)
+        return self._page
+
+    def _groups(self, numbers: list[int], pages: list[str]) -> list[tuple[list[int], list[str]]]:
+        if settings.PDF_SINGLE_PASS:
+            return [(numbers, pages)]
+        return super()._groups(numbers, pages)
+
+    async def _print(self, pages: list[str], name: str) -> bytes:
+        page = await self._lease()
+        return await print_document(page, build_contract_document(pages), name)
+
+
+class NativeEngine(RenderEngine):
+    """
+    Prints text pages with xhtml2pdf and ReportLab, without a browser.
+
+    The page templates' stylesheets are swapped for css/native.css, since
+    xhtml2pdf cannot lay out the browser stylesheets' flex and absolute
+    boxes. Printing runs in a worker thread.
+    """
+
+    name = "native"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._fonts_registered = False
+        self._letterhead: Optional[tuple[int, str]] = None
+
+    def _register_fonts(self) -> None:
+        with self._lock:
+            if self._fonts_registered:
+                return
+            # xhtml2pdf can only shape Arabic with an embedded TrueType font
+            bold = f"{NATIVE_FONT}-bold"
+            pdfmetrics.registerFont(TTFont(NATIVE_FONT, settings.PDF_NATIVE_FONT))
+            pdfmetrics.registerFont(TTFont(bold, settings.PDF_NATIVE_FONT_BOLD))
+            for italic in (0, 1):
+                addMapping(NATIVE_FONT, 0, italic, NATIVE_FONT)
+                addMapping(NATIVE_FONT, 1, italic, bold)
+            DEFAULT_FONT[NATIVE_FONT] = NATIVE_FONT
+            self._fonts_registered = True
+
+    def _letterhead_uri(self) -> Optional[str]:
+        """
+        The letterhead flattened onto white as a JPEG data URI.
+        ReportLab embeds a JPEG as is, where a PNG with an alpha channel is
+        decoded and recompressed on every print.
+        """
+        asset = static_assets.get(LETTERHEAD)
+        if asset is None:
+            return None
+        with self._lock:
+            if self._letterhead is None or self._letterhead[0] != asset.mtime_ns:
+                with Image.open(io.BytesIO(asset.body)) as image:
+                    image = image.convert("RGBA")
+                    flattened = Image.new("RGB", image.size, "white")
+                    flattened.paste(image, mask=image.getchannel("A"))
+                buffer = io.BytesIO()
+                flattened.save(buffer, "JPEG", quality=settings.PDF_IMAGE_JPEG_QUALITY)
+                uri = "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode()
+                self._letterhead = (asset.mtime_ns, uri)
+            return self._letterhead[1]
+
+    def _link_callback(self, uri: str, rel: str) -> str:
+        """Resolve /static/... URLs to files so xhtml2pdf never goes over HTTP."""
+        path = unquote(urlsplit(uri).path)
+        _, marker, relative_path = path.partition("/static/")
+        if not marker:
+            return uri
+        if relative_path == LETTERHEAD:
+            return self._letterhead_uri() or uri
+        return str((STATIC_DIR / relative_path).resolve())
+
+    def _prepare(self, page_html: str) -> str:
+        doc = lxml.html.document_fromstring(page_html)
+        for element in list(doc.iter("link", "style")):
+            element.drop_tree()
+        head = doc.find("head")
+        if head is None:
+            head = lxml.html.Element("head")
+            doc.insert(0, head)
+        stylesheet = static_assets.get(NATIVE_STYLESHEET)
+        style = lxml.html.Element("style")
+        style.text = stylesheet.body.decode() if stylesheet else ""
+        head.append(style)
+        return lxml.html.tostring(doc, encoding="unicode")
+
+    def warm(self) -> None:
+        """Register the fonts and build the letterhead ahead of the first print."""
+        self._register_fonts()
+        self._letterhead_uri()
+
+    def print_html(self, page_html: str) -> bytes:
+        """Print one page template to PDF bytes."""
+        self._register_fonts()
+        buffer = io.BytesIO()
+        status = pisa.CreatePDF(
+            self._prepare(page_html), dest=buffer, link_callback=self._link_callback, encoding="utf-8"
+        )
+        if status.err:
+            raise ValueError(f"xhtml2pdf reported {status.err} errors")
+        return buffer.getvalue()
+
+    async def _print(self, pages: list[str], name: str) -> bytes:
+        with stage_metrics.stage("native_print", name):
+            return await asyncio.to_thread(self.print_html, pages[0])
+
+
+native_engine = NativeEngine()
+
+
+class ContractEngine(PrintEngine):
+    """
+    Prints the pages in `native_pages` with the native engine and the
+    rest with the browser engine it is given.
+    """
+
+    name = "contract"
+
+    def __init__(self, browser: PrintEngine, native_pages: Collection[int]) -> None:
+        self.browser = browser
+        self.native_pages = set(native_pages)
+
+    async def print_pages(
+        self, numbers: list[int], pages: list[str], failed: set[int]
+    ) -> list[PrintedPart]:
+        parts = []
+        for engine in (native_engine, self.browser):
+            selected = [
+                (number, html) for number, html in zip(numbers, pages, strict=True)
+                if (engine is native_engine) == (number in self.native_pages)
+            ]
+            if selected:
+                parts += await engine.print_pages(
+                    [number for number, _ in selected], [html for _, html in selected], failed
+                )
+        return parts
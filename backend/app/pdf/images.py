@@ -0,0 +1,101 @@
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Bump when the way variants are built changes
+VARIANT_VERSION = 1
+
+IMAGE_TYPES = {".png": "PNG", ".jpg": "JPEG", ".jpeg": "JPEG"}
+
+# Largest area an image can cover on the printed page, in CSS pixels
+# (96 per inch). Page backgrounds cover the whole A4 sheet; photos sit in
+# the .content box of .a4-page, which is inset by 250px/150px vertically
+# and 50px horizontally plus 20px of padding.
+PAGE_BOX = (794, 1123)
+CONTENT_BOX = (654, 683)
+
+
+def _print_size(relative_path: str) -> tuple[int, int]:
+    """Pixel size an image needs at PDF_IMAGE_DPI to print sharply."""
+    box = CONTENT_BOX if relative_path.startswith("photos/") else PAGE_BOX
+    scale = settings.PDF_IMAGE_DPI / 96
+    return round(box[0] * scale), round(box[1] * scale)
+
+
+def _build_variant(source: bytes, image_format: str, size: tuple[int, int]) -> bytes:
+    with Image.open(io.BytesIO(source)) as image:
+        image.load()
+        if image.mode == "RGBA" and image.getchannel("A").getextrema() == (255, 255):
+            # An opaque alpha channel only costs decode time and file size
+            image = image.convert("RGB")
+        if image.width > size[0] or image.height > size[1]:
+            image.thumbnail(size, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        if image_format == "JPEG":
+            image.convert("RGB").save(buffer, "JPEG", quality=settings.PDF_IMAGE_JPEG_QUALITY, optimize=True)
+        else:
+            image.save(buffer, "PNG", optimize=True)
+        return buffer.getvalue()
+
+
+class ImageVariants:
+    """
+    Print-sized, recompressed copies of the images embedded in contracts.
+
+    Variants are stored on disk under a hash of the source bytes and the
+    variant settings, so they are built once per image and rebuilt only
+    when the image or the settings change.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def get(self, relative_path: str, source: bytes) -> Optional[bytes]:
+        """Variant for an image, or None when the original is already as small."""
+        image_format = IMAGE_TYPES.get(Path(relative_path).suffix.lower())
+        if not settings.PDF_IMAGE_VARIANTS or image_format is None:
+            return None
+        size = _print_size(relative_path)
+        digest = hashlib.sha256(source)
+        digest.update(
+            f"{VARIANT_VERSION}:{size}:{settings.PDF_IMAGE_JPEG_QUALITY}".encode()
+        )
+        path = self.directory / f"{digest.hexdigest()}.{image_format.lower()}"
+        if path.exists():
+            return path.read_bytes()
+        # An empty marker records that the original was already the smallest
+        marker = path.with_suffix(".original")
+        if marker.exists():
+            return None
+
+        try:
+            variant = _build_variant(source, image_format, size)
+        except Exception as e:
+            logger.warning(f"Could not build print variant of {relative_path}: {e}")
+            return None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if len(variant) >= len(source):
+            marker.touch()
+            return None
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(variant)
+        os.replace(tmp_path, path)
+        logger.info(f"Built print variant of {relative_path}: {len(source) // 1024} KB -> {len(variant) // 1024} KB")
+        return variant
+
+
+image_variants = ImageVariants(BASE_DIR / settings.PDF_CACHE_DIR / "images")
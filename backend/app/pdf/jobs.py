@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlmodel import Session, col, delete, select
+
+from app.core import db
+from app.core.config import settings
+from app.core.writer import db_writer, insert_row, update_row
+from app.models import ContractVersion, PdfJob, PdfJobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class PdfJobQueue:
+    """
+    Background queue of contract renders processed by a bounded worker pool.
+
+    Jobs are stored in the `pdf_jobs` table, so queued work and finished
+    results survive a restart; jobs that were queued or running when the
+    app stopped are queued again on start. A finished job points at the
+    contract version it archived rather than keeping a copy of the PDF,
+    and is deleted `ttl` seconds after it finished.
+
+    Writes go through the database writer, and all database work runs in
+    worker threads so a locked database never stalls the event loop.
+    """
+
+    def __init__(self, workers: int, ttl: int) -> None:
+        self.workers = max(1, workers)
+        self.ttl = ttl
+        self._render: Optional[Callable[[int], Awaitable[ContractVersion]]] = None
+        self._queue: Optional[asyncio.Queue[str]] = None
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def start(self, render: Callable[[int], Awaitable[ContractVersion]]) -> None:
+        """Start the workers; `render` archives a client's contract and returns its version."""
+        if self._queue is not None:
+            return
+        self._render = render
+        self._queue = asyncio.Queue()
+        pending = await asyncio.to_thread(self._requeue)
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+        if pending:
+            logger.info(f"Requeued {len(pending)} unfinished PDF job(s)")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._expire_periodically()))
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def enqueue(self, client_id: int) -> PdfJob:
+        if self._queue is None:
+            raise RuntimeError("PDF job queue is not running")
+        queue = self._queue
+        job = await asyncio.to_thread(self._insert, client_id)
+        # On the event loop, so a waiting worker is woken straight away
+        queue.put_nowait(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[PdfJob]:
+        with Session(db.engine) as session:
+            return session.get(PdfJob, job_id)
+
+    def expire(self, now: Optional[datetime] = None) -> int:
+        """Delete jobs that finished more than `ttl` seconds ago; returns how many."""
+        cutoff = (now or datetime.utcnow()) - timedelta(seconds=self.ttl)
+
+        def expire(session: Session) -> int:
+            result = session.execute(
+                delete(PdfJob)
+                .where(col(PdfJob.status).in_([PdfJobStatus.done, PdfJobStatus.failed]))
+                .where(col(PdfJob.finished_at) < cutoff)
+            )
+            return int(result.rowcount)
+
+        return db_writer.submit(expire)
+
+    def _requeue(self) -> list[str]:
+        def requeue(session: Session) -> list[str]:
+            pending = session.exec(
+                select(PdfJob)
+                .where(col(PdfJob.status).in_([PdfJobStatus.queued, PdfJobStatus.running]))
+                .order_by(col(PdfJob.created_at))
+            ).all()
+            for job in pending:
+                job.status = PdfJobStatus.queued
+                session.add(job)
+            return [job.id for job in pending]
+
+        return db_writer.submit(requeue)
+
+    def _insert(self, client_id: int) -> PdfJob:
+        return db_writer.submit(insert_row(PdfJob, {"client_id": client_id}))
+
+    def _update(self, job_id: str, **fields: object) -> Optional[PdfJob]:
+        return db_writer.submit(update_row(PdfJob, job_id, fields))
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job_id = await queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        assert self._render is not None
+        job = await asyncio.to_thread(self._update, job_id, status=PdfJobStatus.running)
+        if not job:
+            return
+        try:
+            version = await self._render(job.client_id)
+        except Exception as e:
+            logger.error(f"PDF job {job_id} failed: {str(e)}")
+            detail = getattr(e, "detail", None) or str(e)
+            await asyncio.to_thread(
+                self._update, job_id, status=PdfJobStatus.failed, error=detail, finished_at=datetime.utcnow()
+            )
+            return
+        await asyncio.to_thread(
+            self._update, job_id, status=PdfJobStatus.done, version=version.version, finished_at=datetime.utcnow()
+        )
+
+    async def _expire_periodically(self) -> None:
+        while True:
+            try:
+                expired = await asyncio.to_thread(self.expire)
+                if expired:
+                    logger.info(f"Deleted {expired} expired PDF job(s)")
+            except Exception as e:
+                logger.error(f"Could not delete expired PDF jobs: {str(e)}")
+            await asyncio.sleep(min(max(self.ttl, 60), 60 * 60))
+
+
+pdf_jobs = PdfJobQueue(workers=settings.PDF_JOB_WORKERS, ttl=settings.PDF_JOB_TTL)
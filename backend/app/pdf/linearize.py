@@ -0,0 +1,36 @@
+import logging
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+QPDF = shutil.which("qpdf")
+
+# qpdf exits with 3 when it succeeded with warnings
+QPDF_OK = (0, 3)
+
+
+def linearize(path: Path) -> bool:
+    """
+    Rewrite a PDF in place as linearized ("fast web view"), so viewers
+    fetching it with range requests can show the first page before the
+    rest has arrived. Needs the qpdf binary; without it the file is left
+    as is. Returns whether the file was linearized.
+    """
+    if QPDF is None:
+        logger.warning("PDF_LINEARIZE is enabled but qpdf is not installed")
+        return False
+    tmp_path = path.with_name(f"{path.name}.linearized.tmp")
+    result = subprocess.run(
+        [QPDF, "--linearize", "--object-streams=preserve", str(path), str(tmp_path)],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode not in QPDF_OK:
+        tmp_path.unlink(missing_ok=True)
+        logger.error(f"Could not linearize {path.name}: {result.stderr.strip()}")
+        return False
+    os.replace(tmp_path, path)
+    return True
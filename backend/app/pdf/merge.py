@@ -0,0 +1,258 @@
+import hashlib
+import io
+import struct
+import time
+import zlib
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+    NumberObject,
+    StreamObject,
+)
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from app.pdf.metrics import stage_metrics
+
+
+@dataclass
+class PrintedPart:
+    """PDF bytes covering the given contract page numbers, in order."""
+    numbers: list[int]
+    pdf: bytes
+    failed: bool = False
+
+
+def error_pdf(lines: list[str]) -> bytes:
+    """Single-page PDF listing what went wrong, used in place of a failed part."""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    y = 500
+    for line in lines:
+        c.drawString(100, y, line)
+        y -= 20
+    c.save()
+    return buffer.getvalue()
+
+
+class StreamingPdfWriter:
+    """
+    Writes one PDF incrementally from printed parts.
+
+    Each part's pages and the objects they use are serialized as soon as
+    the part is added, so only one part is held in memory at a time. The
+    page tree, catalog and cross-reference table follow in `close`, which
+    is also where pages are put in contract page order; parts can
+    therefore be added in whatever order they finish printing.
+
+    A part whose page count does not match its page numbers (an error
+    placeholder) is placed where its first page would have been.
+
+    With `optimize`, objects are written once however many parts embed
+    them (the letterhead, fonts and images every print pass repeats),
+    uncompressed streams are deflated, and each part's remaining objects
+    are packed into one compressed object stream.
+    """
+
+    CATALOG = 1
+    PAGES = 2
+    # Page attributes a page may inherit from its ancestors in the page tree
+    INHERITED = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+
+    def __init__(self, optimize: bool = False) -> None:
+        self.optimize = optimize
+        self._position = 0
+        self._next_number = self.PAGES + 1
+        self._offsets: dict[int, int] = {}
+        # Object number -> (object stream number, index within it)
+        self._packed: dict[int, tuple[int, int]] = {}
+        # Digest of a serialized object -> the number it was written as
+        self._shared: dict[bytes, int] = {}
+        # (contract page number, order added, object number) for every page
+        self._placed: list[tuple[int, int, int]] = []
+
+    def _emit(self, data: bytes) -> bytes:
+        self._position += len(data)
+        return data
+
+    def _allocate(self) -> int:
+        self._next_number += 1
+        return self._next_number - 1
+
+    def _object(self, number: int, body: bytes) -> bytes:
+        self._offsets[number] = self._position
+        return self._emit(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+
+    def header(self) -> bytes:
+        return self._emit(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def add(self, part: PrintedPart) -> bytes:
+        """Serialize a part's pages, returning the bytes to append."""
+        reader = PdfReader(io.BytesIO(part.pdf))
+        if len(reader.pages) == len(part.numbers):
+            numbers = part.numbers
+        else:
+            numbers = [part.numbers[0]] * len(reader.pages)
+
+        # Source object number -> object number in the output. Anything
+        # pointing at the source page tree points at ours instead.
+        renumbered: dict[int, int] = {reader.trailer["/Root"].raw_get("/Pages").idnum: self.PAGES}
+        in_progress: set[int] = set()
+        pages = {pdf_page.indirect_reference.idnum: pdf_page for pdf_page in reader.pages}
+        chunks: list[bytes] = []
+        packable: list[tuple[int, bytes]] = []
+
+        def copy(value: Any) -> Any:
+            if isinstance(value, IndirectObject):
+                return IndirectObject(resolve(value.idnum), 0, None)
+            if isinstance(value, DictionaryObject):
+                return DictionaryObject({key: copy(item) for key, item in value.items()})
+            if isinstance(value, ArrayObject):
+                return ArrayObject(copy(item) for item in value)
+            return value
+
+        def serialize(source_number: int) -> tuple[bytes, bool]:
+            obj = reader.get_object(IndirectObject(source_number, 0, reader))
+            buffer = io.BytesIO()
+            if source_number in pages:
+                page = DictionaryObject(obj)
+                for key in self.INHERITED:
+                    if key not in page and pages[source_number].get(key) is not None:
+                        page[NameObject(key)] = pages[source_number][key]
+                page[NameObject("/Parent")] = IndirectObject(self.PAGES, 0, None)
+                copy(page).write_to_stream(buffer, None)
+            elif isinstance(obj, StreamObject):
+                data = obj._data
+                stream_dict = copy(DictionaryObject(obj))
+                if self.optimize and "/Filter" not in stream_dict:
+                    data = zlib.compress(data)
+                    stream_dict[NameObject("/Filter")] = NameObject("/FlateDecode")
+                stream_dict[NameObject("/Length")] = NumberObject(len(data))
+                stream_dict.write_to_stream(buffer, None)
+                buffer.write(b"\nstream\n" + data + b"\nendstream")
+                return buffer.getvalue(), True
+            elif obj is None:
+                buffer.write(b"null")
+            else:
+                copy(obj).write_to_stream(buffer, None)
+            return buffer.getvalue(), False
+
+        def resolve(source_number: int) -> int:
+            # Objects are written after everything they refer to, so equal
+            # objects serialize to equal bytes and can be shared
+            if source_number in renumbered:
+                return renumbered[source_number]
+            if source_number in in_progress:
+                # A reference cycle (e.g. an annotation pointing back at
+                # its page); number the object now and write it later
+                renumbered[source_number] = self._allocate()
+                return renumbered[source_number]
+            in_progress.add(source_number)
+            body, is_stream = serialize(source_number)
+            in_progress.discard(source_number)
+
+            digest = None
+            if self.optimize and source_number not in renumbered and source_number not in pages:
+                digest = hashlib.sha256(body).digest()
+                if digest in self._shared:
+                    renumbered[source_number] = self._shared[digest]
+                    return renumbered[source_number]
+            number = renumbered.get(source_number) or self._allocate()
+            renumbered[source_number] = number
+            if digest is not None:
+                self._shared[digest] = number
+            if self.optimize and not is_stream:
+                packable.append((number, body))
+            else:
+                chunks.append(self._object(number, body))
+            return number
+
+        for number, source_number in zip(numbers, pages, strict=True):
+            self._placed.append((number, len(self._placed), resolve(source_number)))
+        if packable:
+            chunks.append(self._object_stream(packable))
+        return b"".join(chunks)
+
+    def _object_stream(self, objects: list[tuple[int, bytes]]) -> bytes:
+        number = self._allocate()
+        index = []
+        bodies = []
+        offset = 0
+        for position, (packed_number, body) in enumerate(objects):
+            index.append(b"%d %d" % (packed_number, offset))
+            bodies.append(body)
+            offset += len(body) + 1
+            self._packed[packed_number] = (number, position)
+        header = b" ".join(index) + b"\n"
+        data = zlib.compress(header + b"\n".join(bodies))
+        return self._object(number, b"<< /Type /ObjStm /N %d /First %d /Filter /FlateDecode /Length %d >>\nstream\n%s\nendstream" % (
+            len(objects), len(header), len(data), data
+        ))
+
+    def close(self) -> bytes:
+        """Write the page tree, catalog and cross-reference table."""
+        kids = b" ".join(b"%d 0 R" % number for _, _, number in sorted(self._placed))
+        chunks = [
+            self._object(self.PAGES, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._placed))),
+            self._object(self.CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % self.PAGES),
+        ]
+        xref_offset = self._position
+        if not self._packed:
+            size = self._next_number
+            xref = [b"xref\n0 %d\n0000000000 65535 f \n" % size]
+            xref.extend(b"%010d 00000 n \n" % self._offsets[number] for number in range(1, size))
+            xref.append(b"trailer\n<< /Size %d /Root %d 0 R >>\n" % (size, self.CATALOG))
+            chunks.append(self._emit(b"".join(xref)))
+        else:
+            # Objects inside object streams need a cross-reference stream
+            xref_number = self._allocate()
+            self._offsets[xref_number] = xref_offset
+            size = self._next_number
+            rows = [struct.pack(">BIH", 0, 0, 65535)]
+            for number in range(1, size):
+                if number in self._packed:
+                    rows.append(struct.pack(">BIH", 2, *self._packed[number]))
+                else:
+                    rows.append(struct.pack(">BIH", 1, self._offsets[number], 0))
+            data = zlib.compress(b"".join(rows))
+            chunks.append(self._object(xref_number, (
+                b"<< /Type /XRef /Size %d /Root %d 0 R /W [1 4 2] /Filter /FlateDecode /Length %d >>\n"
+                b"stream\n%s\nendstream" % (size, self.CATALOG, len(data), data)
+            )))
+        chunks.append(self._emit(b"startxref\n%d\n%%%%EOF\n" % xref_offset))
+        return b"".join(chunks)
+
+
+def merge_parts(parts: list[PrintedPart], optimize: bool = False) -> bytes:
+    """Merge printed parts into one PDF ordered by contract page number."""
+    writer = StreamingPdfWriter(optimize)
+    chunks = [writer.header()]
+    chunks.extend(writer.add(part) for part in parts)
+    chunks.append(writer.close())
+    return b"".join(chunks)
+
+
+async def stream_merged(
+    parts: AsyncIterator[PrintedPart], optimize: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Merge parts into one PDF while they are still being printed, yielding
+    each part's bytes as soon as it arrives.
+    """
+    writer = StreamingPdfWriter(optimize)
+    merging = 0.0
+    yield writer.header()
+    async for part in parts:
+        started = time.perf_counter()
+        chunk = writer.add(part)
+        merging += time.perf_counter() - started
+        yield chunk
+    yield writer.close()
+    stage_metrics.observe("merge", merging)
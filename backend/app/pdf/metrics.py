@@ -0,0 +1,102 @@
+import bisect
+import logging
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class Histogram:
+    counts: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS) + 1))
+    total: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class StageMetrics:
+    """
+    Timing histograms for each stage of the contract PDF pipeline.
+
+    Observations are labeled with the stage name and the contract pages
+    they cover (a page number, or several joined with underscores for a
+    print pass), and every observation is also logged as one key=value line.
+    """
+
+    def __init__(self) -> None:
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+        self._recorded: Optional[list[tuple[str, float, str]]] = None
+
+    def observe(self, stage: str, seconds: float, pages: str = "all") -> None:
+        histogram = self._histograms.setdefault((stage, pages), Histogram())
+        histogram.observe(seconds)
+        if self._recorded is not None:
+            self._recorded.append((stage, seconds, pages))
+        logger.info(f"pdf_stage stage={stage} pages={pages} ms={seconds * 1000:.1f}")
+
+    def record(self) -> None:
+        """Keep every observation from now on so it can be drained, e.g. by a render worker."""
+        self._recorded = []
+
+    def drain(self) -> list[tuple[str, float, str]]:
+        """Observations recorded since the last drain."""
+        recorded = self._recorded or []
+        if self._recorded is not None:
+            self._recorded = []
+        return recorded
+
+    def replay(self, observations: list[tuple[str, float, str]]) -> None:
+        """Add observations drained in another process, without logging them again."""
+        for stage, seconds, pages in observations:
+            self._histograms.setdefault((stage, pages), Histogram()).observe(seconds)
+
+    @contextmanager
+    def stage(self, stage: str, pages: str = "all") -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started, pages)
+
+    async def timed_stream(
+        self, chunks: AsyncIterator[bytes], stage: str = "response_write"
+    ) -> AsyncIterator[bytes]:
+        """Pass a response body through, timing how long it takes to send."""
+        started = time.perf_counter()
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def render(self) -> str:
+        """Histograms in the Prometheus text exposition format."""
+        name = "contract_pdf_stage_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each stage of the contract PDF pipeline.",
+            f"# TYPE {name} histogram",
+        ]
+        for (stage, pages), histogram in sorted(self._histograms.items()):
+            labels = f'stage="{stage}",pages="{pages}"'
+            cumulative = 0
+            # The last count is the +Inf bucket, written from the total below
+            for bound, count in zip(BUCKETS, histogram.counts[:-1], strict=True):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+stage_metrics = StageMetrics()
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+from app.pdf.cache import asset_fingerprint
+from app.pdf.merge import PrintedPart
+
+logger = logging.getLogger(__name__)
+
+
+class PageCache:
+    """
+    In-memory cache of printed contract pages that do not depend on a client.
+
+    The static pages are filled by the startup warm-up. Entries are dropped
+    as soon as a template or static asset changes, so a template edit is
+    picked up by the next contract without a restart.
+    Parts that failed to print are never cached.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._fingerprint: Optional[str] = None
+        self._entries: dict[str, list[PrintedPart]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _check_fingerprint(self) -> None:
+        fingerprint = asset_fingerprint()
+        if fingerprint != self._fingerprint:
+            if self._entries:
+                logger.info(f"Templates changed, clearing {self.name} page cache")
+            self._entries.clear()
+            self._fingerprint = fingerprint
+
+    def get(self, key: str) -> Optional[list[PrintedPart]]:
+        """Cached parts for `key`; checks the asset files, so keep it off the event loop."""
+        self._check_fingerprint()
+        return self._entries.get(key)
+
+    async def get_or_render(
+        self, key: str, render: Callable[[], Awaitable[list[PrintedPart]]]
+    ) -> list[PrintedPart]:
+        parts = await asyncio.to_thread(self.get, key)
+        if parts is not None:
+            return parts
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have rendered it while we waited
+            parts = self._entries.get(key)
+            if parts is not None:
+                return parts
+            parts = await render()
+            if not any(part.failed for part in parts):
+                self._entries[key] = parts
+                logger.info(f"Cached {self.name} pages for {key}")
+            return parts
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+static_pages = PageCache("static")
+# Floor plan annexes, keyed by ApartmentInfo.apt_type
+apartment_type_pages = PageCache("apartment type")
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import time
+
+from playwright.async_api import Page
+
+from app.core.config import settings
+from app.pdf.metrics import stage_metrics
+
+logger = logging.getLogger(__name__)
+
+# Resolves once web fonts are loaded, every <img> is decoded and the
+# optional template hook has settled. Templates that draw asynchronously can
+# set `window.contractReady` to a promise (or a function returning one).
+READY_SCRIPT = """async () => {
+    await document.fonts.ready;
+    await Promise.all(Array.from(document.images, img => img.decode().catch(() => {})));
+    const hook = window.contractReady;
+    if (typeof hook === 'function') {
+        await hook();
+    } else if (hook) {
+        await hook;
+    }
+}"""
+
+
+async def wait_until_ready(page: Page, name: str) -> float:
+    """
+    Wait for the loaded document to be ready to print.
+
+    Gives up after PDF_READY_TIMEOUT seconds and prints whatever is drawn.
+    Returns the number of seconds spent waiting.
+    """
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(page.evaluate(READY_SCRIPT), timeout=settings.PDF_READY_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"{name} not ready after {settings.PDF_READY_TIMEOUT}s, printing anyway")
+    waited = time.perf_counter() - started
+    stage_metrics.observe("readiness", waited, name)
+    return waited
+
+
+async def print_document(page: Page, html: str, name: str) -> bytes:
+    """
+    Print one HTML document to PDF bytes with a leased browser page.
+    `name` labels the stage timings, normally the page numbers printed.
+
+    The document is handed to the browser with set_content and the PDF is
+    returned in memory, so nothing touches the filesystem.
+    """
+    with stage_metrics.stage("navigation", name):
+        await page.set_content(html, wait_until="load")
+    await wait_until_ready(page, name)
+
+    with stage_metrics.stage("pdf", name):
+        return await page.pdf(
+            format="A4",
+            print_background=True,
+            prefer_css_page_size=True,
+            margin={"top": "0mm", "right": "0mm", "bottom": "0mm", "left": "0mm"},
+            scale=1.0
+        )
@@ -0,0 +1,132 @@
+import os
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote
+
+import anyio
+from fastapi import Request, Response
+from starlette.types import Receive, Scope, Send
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison)."""
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    The inclusive byte range asked for by a Range header, or None to send
+    the whole file. Only single ranges are honoured and malformed headers
+    are ignored; raises ValueError for a range that lies outside the file.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, dash, last = (value.strip() for value in header[len("bytes="):].partition("-"))
+    if not dash or not (first or last) or not (first or "0").isdigit() or not (last or "0").isdigit():
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise ValueError("Range not satisfiable")
+    return start, min(end, size - 1)
+
+
+class FileRangeResponse(Response):
+    """
+    Sends a byte range of a file from disk.
+
+    Servers offering the ASGI zero-copy extension send it with sendfile;
+    otherwise the file is read in chunks from a worker thread.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: Path,
+        start: int,
+        end: int,
+        status_code: int,
+        headers: dict[str, str],
+        media_type: str,
+    ) -> None:
+        self.path = path
+        self.start = start
+        self.length = end - start + 1
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers({**headers, "content-length": str(self.length)})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if self.length and "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.start,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            remaining = self.length
+            while remaining:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        # Always end the body, even for an empty file or one cut short
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def archived_file_response(
+    request: Request, path: Path, etag: str, filename: str, media_type: str = "application/pdf"
+) -> Response:
+    """
+    Serve an immutable file with conditional GET and Range support.
+    `etag` must change whenever the file's bytes do.
+    """
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename*=utf-8''{quote(filename)}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    size = os.stat(path).st_size
+    range_header = request.headers.get("range")
+    # A resumed download whose copy is out of date gets the whole file
+    if_range = request.headers.get("if-range")
+    if if_range and if_range != etag:
+        range_header = None
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        return Response(status_code=416, headers={"Content-Range": f"bytes */{size}", "ETag": etag})
+
+    if byte_range is None:
+        return FileRangeResponse(path, 0, size - 1, 200, headers, media_type)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return FileRangeResponse(path, start, end, 206, headers, media_type)
@@ -0,0 +1,59 @@
+import logging
+import time
+from collections.abc import Awaitable, Callable, Collection
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    Startup warm-up of the contract PDF pipeline.
+
+    Steps run in order and are timed. A failing step is logged and
+    recorded rather than raised; `ready` turns true once every step has
+    run. Most steps warm things that are also loaded lazily on first use,
+    but if a `required` step fails, e.g. the renderer could not start, the
+    pipeline cannot print and `healthy` stays false.
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.healthy = True
+        self.steps: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        self.duration: Optional[float] = None
+
+    async def run(
+        self, steps: list[tuple[str, Callable[[], Awaitable[Any]]]], required: Collection[str] = ()
+    ) -> None:
+        started = time.perf_counter()
+        for name, step in steps:
+            step_started = time.perf_counter()
+            try:
+                await step()
+            except Exception as e:
+                logger.warning(f"PDF warm-up step {name} failed: {e}")
+                self.errors[name] = str(e)
+                if name in required:
+                    self.healthy = False
+            self.steps[name] = time.perf_counter() - step_started
+        self.duration = time.perf_counter() - started
+        self.ready = True
+        logger.info(f"PDF pipeline warmed up in {self.duration * 1000:.0f}ms")
+
+    def skip(self) -> None:
+        """Report ready without warming anything up."""
+        self.ready = True
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "healthy": self.healthy,
+            "duration_ms": round(self.duration * 1000) if self.duration is not None else None,
+            "steps_ms": {name: round(seconds * 1000) for name, seconds in self.steps.items()},
+            "errors": self.errors,
+        }
+
+
+pdf_warmup = Warmup()
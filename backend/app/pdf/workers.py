@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Optional
+
+from app.core.config import settings
+from app.pdf.assets import static_assets
+from app.pdf.browser_pool import BrowserPool
+from app.pdf.engines import BrowserEngine, ContractEngine, PrintEngine, native_engine
+from app.pdf.merge import PrintedPart, error_pdf
+from app.pdf.metrics import stage_metrics
+
+logger = logging.getLogger(__name__)
+
+# Workers are started fresh rather than forked from the API process, which
+# has a running event loop and threads of its own
+_context = multiprocessing.get_context("spawn")
+
+
+@dataclass
+class RenderJob:
+    """Rendered contract pages for a worker to print."""
+    numbers: list[int]
+    pages: list[str]
+    failed: set[int]
+    native_pages: list[int]
+
+
+@dataclass
+class RenderResult:
+    parts: list[PrintedPart]
+    # Stage timings observed in the worker, replayed into the API's metrics
+    observations: list[tuple[str, float, str]]
+
+
+def _worker_main(conn: Connection) -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_serve(conn))
+
+
+async def _serve(conn: Connection) -> None:
+    """Print jobs received over `conn` until the API process hangs up."""
+    static_assets.preload()
+    stage_metrics.record()
+    pool = BrowserPool(size=1, lease_timeout=settings.PDF_BROWSER_LEASE_TIMEOUT)
+    if settings.PDF_BROWSER_WARM_ON_STARTUP:
+        try:
+            native_engine.warm()
+        except Exception as e:
+            logger.warning(f"Render worker could not load the native engine fonts: {e}")
+        try:
+            await pool.start()
+        except Exception as e:
+            logger.warning(f"Render worker could not start its browser: {e}")
+    try:
+        while True:
+            try:
+                job: RenderJob = await asyncio.to_thread(conn.recv)
+            except EOFError:
+                return
+            async with BrowserEngine(pool) as browser:
+                engine = ContractEngine(browser, job.native_pages)
+                parts = await engine.print_pages(job.numbers, job.pages, job.failed)
+            conn.send(RenderResult(parts, stage_metrics.drain()))
+    finally:
+        await pool.close()
+
+
+class RenderWorker:
+    """A worker process and the API's end of its pipe."""
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.conn, child_conn = _context.Pipe()
+        self.process: BaseProcess = _context.Process(
+            target=_worker_main, args=(child_conn,), name=f"pdf-render-{index}", daemon=True
+        )
+        self.process.start()
+        # Only the worker holds its end, so reads here fail as soon as it exits
+        child_conn.close()
+        self.healthy = True
+
+    def is_alive(self) -> bool:
+        return self.healthy and self.process.is_alive()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self.conn.close()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+
+class RenderWorkerPool(PrintEngine):
+    """
+    Pool of worker processes that print contract pages.
+
+    Each worker runs its own event loop and holds its own Chromium browser,
+    so printing never competes with API requests for the API's event loop
+    or GIL. Rendered page HTML is sent to an idle worker over a pipe and
+    the printed parts come back the same way. A worker that crashes or
+    does not answer within `job_timeout` is killed and replaced, and the
+    pages it was printing become error pages.
+    """
+
+    name = "worker"
+
+    def __init__(self, size: int, lease_timeout: float, job_timeout: float) -> None:
+        self.size = max(1, size)
+        self.lease_timeout = lease_timeout
+        self.job_timeout = job_timeout
+        self._idle: Optional[asyncio.Queue[RenderWorker]] = None
+
+    @property
+    def started(self) -> bool:
+        return self._idle is not None
+
+    async def start(self) -> None:
+        if self.started:
+            return
+        idle: asyncio.Queue[RenderWorker] = asyncio.Queue()
+        for index in range(self.size):
+            idle.put_nowait(await asyncio.to_thread(RenderWorker, index))
+        self._idle = idle
+        logger.info(f"Started {self.size} PDF render worker(s)")
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, None
+        if idle is not None:
+            while not idle.empty():
+                await asyncio.to_thread(idle.get_nowait().stop)
+
+    async def _run(self, worker: RenderWorker, job: RenderJob) -> RenderResult:
+        await asyncio.to_thread(worker.conn.send, job)
+        return await asyncio.to_thread(worker.conn.recv)
+
+    async def print_pages(
+        self, numbers: list[int], pages: list[str], failed: set[int]
+    ) -> list[PrintedPart]:
+        if not self.started:
+            await self.start()
+        assert self._idle is not None
+        idle = self._idle
+        try:
+            worker = await asyncio.wait_for(idle.get(), timeout=self.lease_timeout)
+        except asyncio.TimeoutError:
+            raise RuntimeError("Timed out waiting for a free render worker")
+
+        name = "_".join(str(number) for number in numbers)
+        job = RenderJob(numbers, pages, failed, list(settings.PDF_NATIVE_PAGES))
+        try:
+            if not worker.is_alive():
+                logger.warning(f"Restarting render worker {worker.index}")
+                await asyncio.to_thread(worker.stop)
+                worker = await asyncio.to_thread(RenderWorker, worker.index)
+            result = await asyncio.wait_for(self._run(worker, job), timeout=self.job_timeout)
+        except (asyncio.TimeoutError, EOFError, OSError) as e:
+            worker.healthy = False
+            reason = str(e) or type(e).__name__
+            logger.error(f"Render worker {worker.index} failed printing pages {name}: {reason}")
+            return [PrintedPart(numbers, error_pdf([f"Error printing pages {name}", reason]), failed=True)]
+        except BaseException:
+            # Cancelled mid-job: the worker's answer would reach the next job
+            worker.healthy = False
+            raise
+        finally:
+            if not worker.healthy:
+                # Killing the worker also ends a read still waiting on it
+                worker.process.kill()
+            if idle is self._idle:
+                idle.put_nowait(worker)
+            else:
+                await asyncio.to_thread(worker.stop)
+
+        stage_metrics.replay(result.observations)
+        return result.parts
+
+
+render_workers = RenderWorkerPool(
+    size=settings.PDF_RENDER_WORKERS,
+    lease_timeout=settings.PDF_BROWSER_LEASE_TIMEOUT,
+    job_timeout=settings.PDF_RENDER_WORKER_TIMEOUT,
+)
@@ -0,0 +1,63 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_create_and_read_apartment(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    data = {
+        "building": "9",
+        "floor": 3,
+        "apt_no": 301,
+        "area": 120,
+        "meter_price": 1500,
+        "apt_type": "A1",
+    }
+    response = client.post(
+        f"{settings.API_V1_STR}/apartments/",
+        headers=superuser_token_headers,
+        json=data,
+    )
+    assert response.status_code == 200
+    created = response.json()
+
+    try:
+        response = client.get(
+            f"{settings.API_V1_STR}/apartments/{created['id']}",
+            headers=superuser_token_headers,
+        )
+        assert response.status_code == 200
+        assert response.json() == created
+
+        response = client.get(
+            f"{settings.API_V1_STR}/apartments/",
+            headers=superuser_token_headers,
+            params={"limit": 1000},
+        )
+        assert response.status_code == 200
+        assert created["id"] in [apartment["id"] for apartment in response.json()]
+    finally:
+        client.delete(
+            f"{settings.API_V1_STR}/apartments/{created['id']}",
+            headers=superuser_token_headers,
+        )
+
+
+def test_read_apartment_not_found(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/apartments/999999",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Apartment not found"}
+
+
+def test_read_apartments_requires_token(client: TestClient) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/apartments/",
+        headers={"Authorization": "Bearer not-a-token"},
+    )
+    assert response.status_code == 403
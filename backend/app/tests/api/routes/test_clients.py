@@ -0,0 +1,65 @@
+import random
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.tests.utils.utils import random_lower_string
+
+
+def test_search_clients(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/apartments/",
+        headers=superuser_token_headers,
+        json={"building": "9", "floor": 4, "apt_no": 401, "area": 120, "meter_price": 1500, "apt_type": "A1"},
+    )
+    assert response.status_code == 200
+    apartment = response.json()
+    name = random_lower_string()
+    response = client.post(
+        f"{settings.API_V1_STR}/clients/",
+        headers=superuser_token_headers,
+        json={
+            "name": f"{name} Hassan",
+            "id_no": 123456789,
+            "issue_date": "2024-01-01",
+            "no": random.randint(10**8, 10**9),
+            "m": "901",
+            "z": "12",
+            "d": "Karrada",
+            "phone_number": "07701234567",
+            "registry_no": "4521",
+            "newspaper_no": "17",
+            "job_title": "Engineer",
+            "alt_name": "Omar",
+            "alt_kinship": "Brother",
+            "alt_phone": "07809876543",
+            "alt_m": 1,
+            "alt_z": 2,
+            "alt_d": 3,
+            "apt_id": apartment["id"],
+        },
+    )
+    assert response.status_code == 200
+    created = response.json()
+
+    try:
+        response = client.get(
+            f"{settings.API_V1_STR}/clients/search",
+            headers=superuser_token_headers,
+            params={"q": f"{name[:8]} has"},
+        )
+        assert response.status_code == 200
+        assert [found["id"] for found in response.json()] == [created["id"]]
+
+        response = client.get(
+            f"{settings.API_V1_STR}/clients/search",
+            headers=superuser_token_headers,
+            params={"q": f"{name} Saleh"},
+        )
+        assert response.status_code == 200
+        assert response.json() == []
+    finally:
+        client.delete(f"{settings.API_V1_STR}/clients/{created['id']}", headers=superuser_token_headers)
+        client.delete(f"{settings.API_V1_STR}/apartments/{apartment['id']}", headers=superuser_token_headers)
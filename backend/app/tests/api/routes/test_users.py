@@ -63,6 +63,7 @@ def test_get_existing_user(
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     user_id = user.id
     r = client.get(
         f"{settings.API_V1_STR}/users/{user_id}",
@@ -80,6 +81,7 @@ def test_get_existing_user_current_user(client: TestClient, db: Session) -> None
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     user_id = user.id
 
     login_data = {
@@ -121,6 +123,7 @@ def test_create_user_existing_username(
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     crud.create_user(session=db, user_create=user_in)
+    db.commit()
     data = {"email": username, "password": password}
     r = client.post(
         f"{settings.API_V1_STR}/users/",
@@ -153,11 +156,13 @@ def test_retrieve_users(
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     crud.create_user(session=db, user_create=user_in)
+    db.commit()
 
     username2 = random_email()
     password2 = random_lower_string()
     user_in2 = UserCreate(email=username2, password=password2)
     crud.create_user(session=db, user_create=user_in2)
+    db.commit()
 
     r = client.get(f"{settings.API_V1_STR}/users/", headers=superuser_token_headers)
     all_users = r.json()
@@ -252,6 +257,7 @@ def test_update_user_me_email_exists(
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
 
     data = {"email": user.email}
     r = client.patch(
@@ -327,6 +333,7 @@ def test_update_user(
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
 
     data = {"full_name": "Updated_full_name"}
     r = client.patch(
@@ -366,11 +373,13 @@ def test_update_user_email_exists(
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
 
     username2 = random_email()
     password2 = random_lower_string()
     user_in2 = UserCreate(email=username2, password=password2)
     user2 = crud.create_user(session=db, user_create=user_in2)
+    db.commit()
 
     data = {"email": user2.email}
     r = client.patch(
@@ -387,6 +396,7 @@ def test_delete_user_me(client: TestClient, db: Session) -> None:
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     user_id = user.id
 
     login_data = {
@@ -432,6 +442,7 @@ def test_delete_user_super_user(
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     user_id = user.id
     r = client.delete(
         f"{settings.API_V1_STR}/users/{user_id}",
@@ -477,6 +488,7 @@ def test_delete_user_without_privileges(
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
 
     r = client.delete(
         f"{settings.API_V1_STR}/users/{user.id}",
@@ -12,6 +12,16 @@ from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
 
 
+@pytest.fixture(scope="session", autouse=True)
+def pdf_settings() -> Generator[None, None, None]:
+    # Keep app startup from launching render workers and browsers; the
+    # warm-up is covered by its own tests
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(settings, "PDF_WARMUP_ON_STARTUP", False)
+        monkeypatch.setattr(settings, "PDF_RENDER_WORKERS", 0)
+        yield
+
+
 @pytest.fixture(scope="session", autouse=True)
 def db() -> Generator[Session, None, None]:
     with Session(engine) as session:
@@ -0,0 +1,18 @@
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.db import engine
+
+
+def test_sqlite_pragmas_are_applied_to_each_connection() -> None:
+    with engine.connect() as connection:
+        def pragma(name: str) -> object:
+            return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+        assert str(pragma("journal_mode")).upper() == settings.SQLITE_JOURNAL_MODE
+        # NORMAL
+        assert pragma("synchronous") == 1
+        # MEMORY
+        assert pragma("temp_store") == 2
+        assert pragma("cache_size") == settings.SQLITE_CACHE_SIZE
+        assert pragma("busy_timeout") == settings.SQLITE_BUSY_TIMEOUT
@@ -0,0 +1,41 @@
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+from sqlmodel import SQLModel, create_engine, select
+
+from app.models import ApartmentInfo, ClientInfo, History, Payment
+
+# Queries behind the by-client, by-apartment, by-type and filter routes and
+# the contract page renderers
+HOT_QUERIES = {
+    "payments_by_client": select(Payment).where(Payment.client_id == 1),
+    "payments_by_type": select(Payment).where(Payment.payment_type_id == 1),
+    "payments_by_date": select(Payment).where(Payment.date_of_payment >= "2025-01-01"),
+    "clients_by_apartment": select(ClientInfo).where(ClientInfo.apt_id == 1),
+    "histories_by_type": select(History).where(History.type_id == 1),
+    "histories_by_entity": select(History).where(History.entity_id == 1),
+    "histories_by_datetime": select(History).where(History.datetime >= "2025-01-01"),
+    "filter_clients_by_apartment": select(ClientInfo)
+    .join(ApartmentInfo, ClientInfo.apt_id == ApartmentInfo.id)
+    .where(ApartmentInfo.building == "1", ApartmentInfo.floor == 2, ApartmentInfo.apt_no == 201),
+}
+
+
+@pytest.fixture(scope="module")
+def schema_engine() -> Generator[Engine, None, None]:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_an_index(schema_engine: Engine, name: str) -> None:
+    statement: Select = HOT_QUERIES[name]
+    sql = str(statement.compile(schema_engine, compile_kwargs={"literal_binds": True}))
+    with schema_engine.connect() as connection:
+        plan = [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+    scans = [step for step in plan if step.startswith("SCAN")]
+    assert not scans, f"{name} scans a table: {plan}"
@@ -0,0 +1,86 @@
+from collections.abc import Generator
+from datetime import date
+from typing import Any
+
+import pytest
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.search import create_client_search, match_expression, search_statement
+from app.models import ApartmentInfo, ClientInfo
+
+
+@pytest.fixture
+def search_engine() -> Generator[Engine, None, None]:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        create_client_search(connection)
+    yield engine
+    engine.dispose()
+
+
+def _client(no: int, apt_id: int, **values: Any) -> ClientInfo:
+    fields: dict[str, Any] = {
+        "name": "", "id_no": no, "issue_date": date(2024, 1, 1), "no": no, "m": "", "z": "", "d": "",
+        "phone_number": "", "registry_no": "", "newspaper_no": "", "job_title": "", "alt_name": "",
+        "alt_kinship": "", "alt_phone": "", "alt_m": 1, "alt_z": 1, "alt_d": 1, "apt_id": apt_id,
+    }
+    return ClientInfo(**{**fields, **values})
+
+
+def _search(session: Session, query: str) -> list[str]:
+    expression = match_expression(query)
+    assert expression is not None
+    return [client.name for client in session.exec(search_statement(expression))]
+
+
+def test_match_expression_quotes_each_word_as_a_prefix() -> None:
+    assert match_expression("  محمد  077 ") == '"محمد"* "077"*'
+    assert match_expression('ali" OR name:x') == '"ali"* "OR"* "name:x"*'
+    assert match_expression("  ") is None
+
+
+def test_search_ranks_prefix_matches_and_follows_changes(search_engine: Engine) -> None:
+    with Session(search_engine) as session:
+        apartment = ApartmentInfo(building="1", floor=1, apt_no=101, area=100, meter_price=1000, apt_type="A1")
+        session.add(apartment)
+        session.commit()
+        session.add(_client(1, apartment.id, name="Omar Hassan", phone_number="07701112222"))
+        session.add(_client(2, apartment.id, name="Zaid Ali", alt_name="Omar Saleh"))
+        session.add(_client(3, apartment.id, name="Noor", registry_no="R4521"))
+        session.commit()
+
+        # A match on the client's own name ranks above the alternate's
+        assert _search(session, "om") == ["Omar Hassan", "Zaid Ali"]
+        assert _search(session, "0770") == ["Omar Hassan"]
+        assert _search(session, "r45") == ["Noor"]
+        assert _search(session, "omar sal") == ["Zaid Ali"]
+
+        noor = session.get(ClientInfo, 3)
+        assert noor is not None
+        noor.name = "Noor Omari"
+        session.add(noor)
+        session.delete(session.get(ClientInfo, 1))
+        session.commit()
+
+        assert _search(session, "omar") == ["Noor Omari", "Zaid Ali"]
+        assert _search(session, "0770") == []
+
+
+def test_create_client_search_indexes_existing_clients() -> None:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        apartment = ApartmentInfo(building="1", floor=1, apt_no=101, area=100, meter_price=1000, apt_type="A1")
+        session.add(apartment)
+        session.commit()
+        session.add(_client(1, apartment.id, name="Huda"))
+        session.commit()
+
+        with engine.begin() as connection:
+            create_client_search(connection)
+            # Running it again leaves the index as it is
+            create_client_search(connection)
+        assert _search(session, "hu") == ["Huda"]
+    engine.dispose()
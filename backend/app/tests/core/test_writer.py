@@ -0,0 +1,90 @@
+import threading
+import time
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.writer import WriteCoordinator, insert_row
+from app.models import PaymentType, PaymentTypeCreate
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Generator[Engine, None, None]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'writer.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine, tables=[PaymentType.__table__])
+    yield engine
+    engine.dispose()
+
+
+def wait_for_queue(writer: WriteCoordinator, size: int) -> None:
+    for _ in range(500):
+        if writer._queue.qsize() >= size:
+            return
+        time.sleep(0.01)
+    raise AssertionError("Writes were not queued")
+
+
+def test_concurrent_writes_share_one_commit(engine: Engine) -> None:
+    writer = WriteCoordinator(engine, max_batch=64)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(_session: Session) -> str:
+        started.set()
+        release.wait()
+        return "first"
+
+    try:
+        with ThreadPoolExecutor(max_workers=11) as pool:
+            first = pool.submit(writer.submit, blocking)
+            # Later writes queue up while the first one is being committed
+            assert started.wait(5)
+            names = [f"type {index}" for index in range(10)]
+            rows = [pool.submit(writer.submit, insert_row(PaymentType, PaymentTypeCreate(name=name))) for name in names]
+            wait_for_queue(writer, 10)
+            release.set()
+            assert first.result() == "first"
+            # Each caller gets its own row back, readable after the commit
+            assert sorted(row.result().name for row in rows) == names
+            assert all(row.result().id for row in rows)
+    finally:
+        writer.close()
+
+    assert writer.units == 11
+    assert writer.commits == 2
+
+
+def test_failing_write_only_fails_its_caller(engine: Engine) -> None:
+    writer = WriteCoordinator(engine, max_batch=64)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(_session: Session) -> None:
+        started.set()
+        release.wait()
+
+    def failing(session: Session) -> None:
+        session.add(PaymentType(name="never stored"))
+        raise ValueError("bad payment")
+
+    try:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            blocker = pool.submit(writer.submit, blocking)
+            assert started.wait(5)
+            ok = pool.submit(writer.submit, insert_row(PaymentType, PaymentTypeCreate(name="Cash")))
+            bad = pool.submit(writer.submit, failing)
+            wait_for_queue(writer, 2)
+            release.set()
+            blocker.result()
+            assert ok.result().name == "Cash"
+            with pytest.raises(ValueError):
+                bad.result()
+    finally:
+        writer.close()
+
+    with Session(engine) as session:
+        assert [row.name for row in session.exec(select(PaymentType)).all()] == ["Cash"]
@@ -3,6 +3,7 @@ from sqlmodel import Session
 
 from app import crud
 from app.core.security import verify_password
+from app.core.writer import db_writer
 from app.models import User, UserCreate, UserUpdate
 from app.tests.utils.utils import random_email, random_lower_string
 
@@ -12,6 +13,7 @@ def test_create_user(db: Session) -> None:
     password = random_lower_string()
     user_in = UserCreate(email=email, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     assert user.email == email
     assert hasattr(user, "hashed_password")
 
@@ -21,6 +23,7 @@ def test_authenticate_user(db: Session) -> None:
     password = random_lower_string()
     user_in = UserCreate(email=email, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     authenticated_user = crud.authenticate(session=db, email=email, password=password)
     assert authenticated_user
     assert user.email == authenticated_user.email
@@ -38,6 +41,7 @@ def test_check_if_user_is_active(db: Session) -> None:
     password = random_lower_string()
     user_in = UserCreate(email=email, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     assert user.is_active is True
 
 
@@ -46,6 +50,7 @@ def test_check_if_user_is_active_inactive(db: Session) -> None:
     password = random_lower_string()
     user_in = UserCreate(email=email, password=password, disabled=True)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     assert user.is_active
 
 
@@ -54,6 +59,7 @@ def test_check_if_user_is_superuser(db: Session) -> None:
     password = random_lower_string()
     user_in = UserCreate(email=email, password=password, is_superuser=True)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     assert user.is_superuser is True
 
 
@@ -62,6 +68,7 @@ def test_check_if_user_is_superuser_normal_user(db: Session) -> None:
     password = random_lower_string()
     user_in = UserCreate(email=username, password=password)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     assert user.is_superuser is False
 
 
@@ -70,6 +77,7 @@ def test_get_user(db: Session) -> None:
     username = random_email()
     user_in = UserCreate(email=username, password=password, is_superuser=True)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     user_2 = db.get(User, user.id)
     assert user_2
     assert user.email == user_2.email
@@ -81,11 +89,27 @@ def test_update_user(db: Session) -> None:
     email = random_email()
     user_in = UserCreate(email=email, password=password, is_superuser=True)
     user = crud.create_user(session=db, user_create=user_in)
+    db.commit()
     new_password = random_lower_string()
     user_in_update = UserUpdate(password=new_password, is_superuser=True)
     if user.id is not None:
         crud.update_user(session=db, db_user=user, user_in=user_in_update)
+        db.commit()
     user_2 = db.get(User, user.id)
     assert user_2
     assert user.email == user_2.email
     assert verify_password(new_password, user_2.hashed_password)
+
+
+def test_create_user_as_a_unit_of_work(db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user_in = UserCreate(email=email, password=password)
+    # The writer commits; the helper itself only flushes
+    user = db_writer.submit(lambda session: crud.create_user(session=session, user_create=user_in))
+    user_update = UserUpdate(full_name="Unit")
+    updated = db_writer.submit(
+        lambda session: crud.update_user_by_id(session=session, user_id=user.id, user_in=user_update)
+    )
+    assert updated and updated.full_name == "Unit"
+    assert crud.authenticate(session=db, email=email, password=password)
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.pdf.admission import RenderAdmission, RenderQueueFull
+
+
+def test_render_admission_rejects_when_queue_is_full() -> None:
+    async def run() -> None:
+        admission = RenderAdmission(limit=1, max_waiting=1)
+        release = asyncio.Event()
+
+        async def render() -> None:
+            async with admission.admit():
+                await release.wait()
+
+        running = asyncio.create_task(render())
+        queued = asyncio.create_task(render())
+        await asyncio.sleep(0)
+        assert admission.stats()["active"] == 1
+        assert admission.stats()["waiting"] == 1
+
+        with pytest.raises(RenderQueueFull) as exc_info:
+            async with admission.admit():
+                pass
+        assert exc_info.value.retry_after >= 1
+        assert admission.stats()["rejected"] == 1
+
+        release.set()
+        await asyncio.gather(running, queued)
+        assert admission.stats()["admitted"] == 2
+        assert admission.stats()["active"] == 0
+
+    asyncio.run(run())
+
+
+def test_render_admission_background_work_waits() -> None:
+    async def run() -> None:
+        admission = RenderAdmission(limit=1, max_waiting=0)
+        release = asyncio.Event()
+
+        async def render(reject_when_full: bool) -> None:
+            async with admission.admit(reject_when_full=reject_when_full):
+                await release.wait()
+
+        running = asyncio.create_task(render(True))
+        await asyncio.sleep(0)
+        background = asyncio.create_task(render(False))
+        await asyncio.sleep(0)
+        assert admission.stats()["waiting"] == 1
+        release.set()
+        await asyncio.gather(running, background)
+        assert admission.stats()["rejected"] == 0
+
+    asyncio.run(run())
@@ -0,0 +1,193 @@
+import asyncio
+import os
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, delete
+
+from app.core import db
+from app.core.db import engine
+from app.core.writer import db_writer
+from app.models import ContractVersion
+from app.pdf import archive as archive_module
+from app.pdf import cache
+from app.pdf.archive import ContractArchive
+from app.pdf.responses import FileRangeResponse, archived_file_response, parse_range
+
+CLIENT_ID = 987654
+
+
+@pytest.fixture
+def archive(tmp_path: Path) -> Generator[ContractArchive, None, None]:
+    yield ContractArchive(tmp_path, max_bytes=0)
+    with Session(engine) as session:
+        session.execute(delete(ContractVersion).where(ContractVersion.client_id == CLIENT_ID))
+        session.commit()
+
+
+def archive_pdf(archive: ContractArchive, input_key: str, data: bytes) -> ContractVersion:
+    entry = archive.writer(CLIENT_ID, input_key)
+    try:
+        entry.write(data)
+        return entry.commit()
+    finally:
+        entry.close()
+
+
+def test_archive_numbers_versions_and_reuses_unchanged_inputs(archive: ContractArchive) -> None:
+    first = archive_pdf(archive, "a", b"%PDF-1.4 first")
+    assert first.version == 1
+    assert archive.find(CLIENT_ID, "a").sha256 == first.sha256
+    assert archive.path(first).read_bytes() == b"%PDF-1.4 first"
+
+    # Reprinting unchanged inputs does not add a version
+    assert archive_pdf(archive, "a", b"%PDF-1.4 first").version == 1
+
+    second = archive_pdf(archive, "b", b"%PDF-1.4 second")
+    assert second.version == 2
+    assert [version.version for version in archive.versions(CLIENT_ID)] == [1, 2]
+    assert archive.get(CLIENT_ID, 1).sha256 == first.sha256
+    assert archive.find(CLIENT_ID, "c") is None
+
+
+def test_archive_keeps_the_version_of_identical_bytes(archive: ContractArchive) -> None:
+    first = archive_pdf(archive, "a", b"%PDF-1.4 same")
+    # New inputs that print the same bytes, e.g. a touched template
+    again = archive_pdf(archive, "b", b"%PDF-1.4 same")
+    assert again.version == first.version == 1
+    assert archive.find(CLIENT_ID, "b").version == 1
+    assert [version.version for version in archive.versions(CLIENT_ID)] == [1]
+
+
+def test_asset_fingerprint_follows_contents_not_timestamps(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cache, "APP_DIR", tmp_path)
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "static").mkdir()
+    template = tmp_path / "templates" / "page.html"
+    template.write_text("<p>one</p>")
+    fingerprint = cache.asset_fingerprint()
+
+    # A fresh checkout gives every file a new modification time
+    os.utime(template, ns=(1, 1))
+    assert cache.asset_fingerprint() == fingerprint
+
+    template.write_text("<p>two</p>")
+    assert cache.asset_fingerprint() != fingerprint
+
+
+def test_archive_prunes_old_versions_past_its_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Its own database, so pruning cannot touch other tests' versions; one
+    # shared connection, as the writer thread opens its own otherwise
+    private = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    monkeypatch.setattr(db, "engine", private)
+    monkeypatch.setattr(db_writer, "engine", private)
+    SQLModel.metadata.create_all(db.engine)
+    # Candidates are loaded one at a time, so pruning has to go round
+    monkeypatch.setattr(archive_module, "PRUNE_BATCH", 1)
+    archive = ContractArchive(tmp_path, max_bytes=250)
+
+    v1 = archive_pdf(archive, "a", b"1" * 100)
+    v2 = archive_pdf(archive, "b", b"2" * 100)
+    assert archive.find(CLIENT_ID, "a")
+    # A third file goes over the budget: the oldest version is pruned
+    v3 = archive_pdf(archive, "c", b"3" * 100)
+    assert [version.version for version in archive.versions(CLIENT_ID)] == [2, 3]
+    assert not archive.path(v1).exists()
+    assert archive.path(v2).exists()
+
+    # The latest version is kept even when it alone exceeds the budget
+    v4 = archive_pdf(archive, "d", b"4" * 300)
+    assert [version.version for version in archive.versions(CLIENT_ID)] == [4]
+    assert not archive.path(v2).exists() and not archive.path(v3).exists()
+    assert archive.path(v4).exists()
+    db.engine.dispose()
+
+
+def test_archive_discards_uncommitted_writes(archive: ContractArchive, tmp_path: Path) -> None:
+    entry = archive.writer(CLIENT_ID, "a")
+    entry.write(b"%PDF-")
+    entry.close()
+    assert archive.find(CLIENT_ID, "a") is None
+    assert not list(tmp_path.rglob("*.tmp"))
+    assert not list(tmp_path.rglob("*.pdf"))
+
+
+def test_parse_range() -> None:
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    # Multiple ranges are answered with the whole file
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    # Malformed ranges are ignored
+    assert parse_range("bytes=5-abc", 100) is None
+    assert parse_range("bytes=abc", 100) is None
+    assert parse_range("bytes=9-5", 100) is None
+    assert parse_range("items=0-9", 100) is None
+    with pytest.raises(ValueError):
+        parse_range("bytes=100-", 100)
+    with pytest.raises(ValueError):
+        parse_range("bytes=-0", 100)
+
+
+def test_archived_file_response_conditional_and_range(tmp_path: Path) -> None:
+    path = tmp_path / "contract.pdf"
+    path.write_bytes(b"0123456789")
+    app = FastAPI()
+
+    @app.get("/contract")
+    def contract(request: Request) -> object:
+        return archived_file_response(request, path, etag='"abc"', filename="contract.pdf")
+
+    client = TestClient(app)
+    response = client.get("/contract")
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["accept-ranges"] == "bytes"
+
+    assert client.get("/contract", headers={"If-None-Match": '"abc"'}).status_code == 304
+
+    response = client.get("/contract", headers={"Range": "bytes=2-5"})
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["content-range"] == "bytes 2-5/10"
+
+    # A resumed download of a different file starts over
+    response = client.get("/contract", headers={"Range": "bytes=2-5", "If-Range": '"old"'})
+    assert response.status_code == 200
+
+    response = client.get("/contract", headers={"Range": "bytes=20-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */10"
+
+    response = client.get("/contract", headers={"Range": "bytes=5-abc"})
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
+
+
+def test_file_range_response_ends_the_body_of_an_empty_file(tmp_path: Path) -> None:
+    path = tmp_path / "empty.pdf"
+    path.write_bytes(b"")
+    messages: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request"}
+
+    async def send(message: dict[str, Any]) -> None:
+        messages.append(message)
+
+    response = FileRangeResponse(path, 0, -1, 200, {}, "application/pdf")
+    asyncio.run(response({"type": "http", "method": "GET"}, receive, send))
+    assert messages[0]["type"] == "http.response.start"
+    assert messages[-1] == {"type": "http.response.body", "body": b"", "more_body": False}
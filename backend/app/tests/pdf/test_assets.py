@@ -0,0 +1,35 @@
+import os
+from pathlib import Path
+
+from app.pdf.assets import StaticAssets
+
+
+def test_static_assets_resolve_url(tmp_path: Path) -> None:
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "base.css").write_text("body {}")
+    assets = StaticAssets(tmp_path)
+    asset = assets.resolve_url("http://testserver/static/css/base.css")
+    assert asset is not None
+    assert asset.body == b"body {}"
+    assert asset.content_type == "text/css"
+
+
+def test_static_assets_missing_and_outside_files(tmp_path: Path) -> None:
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    (tmp_path / "secret.txt").write_text("secret")
+    assets = StaticAssets(static_dir)
+    assert assets.resolve_url("http://testserver/static/missing.png") is None
+    assert assets.resolve_url("http://testserver/static/../secret.txt") is None
+    assert assets.resolve_url("http://testserver/other/base.css") is None
+
+
+def test_static_assets_reload_changed_file(tmp_path: Path) -> None:
+    path = tmp_path / "all.css"
+    path.write_text("a {}")
+    assets = StaticAssets(tmp_path)
+    assert assets.get("all.css").body == b"a {}"  # type: ignore[union-attr]
+    path.write_text("b {}")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert assets.get("all.css").body == b"b {}"  # type: ignore[union-attr]
@@ -0,0 +1,56 @@
+import asyncio
+import io
+import zipfile
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.api.routes import pages
+from app.models import ApartmentInfo, ClientInfo
+from app.pdf.archive import ContractArchive
+from app.pdf.batch import stream_contracts_zip
+from app.pdf.merge import PrintedPart, error_pdf
+
+
+async def collect(client_ids: list[int]) -> bytes:
+    async def render(client_id: int) -> bytes:
+        if client_id == 3:
+            raise RuntimeError("Apartment not found")
+        await asyncio.sleep(0.01 * (5 - client_id))
+        return f"%PDF {client_id}".encode()
+
+    chunks = [chunk async for chunk in stream_contracts_zip(client_ids, render, concurrency=2)]
+    return b"".join(chunks)
+
+
+def test_stream_contracts_zip() -> None:
+    data = asyncio.run(collect([1, 2, 3, 4]))
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        names = set(archive.namelist())
+        assert names == {
+            "contract_1.pdf",
+            "contract_2.pdf",
+            "contract_3_error.txt",
+            "contract_4.pdf",
+        }
+        assert archive.read("contract_2.pdf") == b"%PDF 2"
+        assert archive.read("contract_3_error.txt") == b"Apartment not found"
+
+
+def test_render_client_contract_raises_when_a_page_failed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    client_info = ClientInfo.model_construct(id=987655, apt_id=1)
+    apartment_info = ApartmentInfo.model_construct(id=1, apt_type="A1")
+
+    async def contract_parts(*_: Any) -> AsyncIterator[PrintedPart]:
+        yield PrintedPart([1], error_pdf(["Error printing page 1"]), failed=True)
+
+    monkeypatch.setattr(pages, "_load_contract", lambda _: (client_info, apartment_info))
+    monkeypatch.setattr(pages, "contract_cache_key", lambda *_: "key")
+    monkeypatch.setattr(pages, "_contract_parts", contract_parts)
+    monkeypatch.setattr(pages, "contract_archive", ContractArchive(tmp_path, max_bytes=0))
+    with pytest.raises(RuntimeError, match="could not be printed"):
+        asyncio.run(pages.render_client_contract(object(), client_info.id))
+    # Nothing was archived from the failed print
+    assert not list(tmp_path.rglob("*.pdf"))
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from app.pdf.browser_pool import BrowserPool, BrowserSlot
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakePage:
+    def is_closed(self) -> bool:
+        return False
+
+
+def _slot(index: int) -> BrowserSlot:
+    return BrowserSlot(index=index, browser=FakeBrowser(), context=object(), page=FakePage())  # type: ignore[arg-type]
+
+
+def _pool(slots: list[BrowserSlot], lease_timeout: float = 1.0) -> BrowserPool:
+    """A started pool holding `slots` whose relaunches make fake browsers."""
+    pool = BrowserPool(size=len(slots), lease_timeout=lease_timeout)
+    pool.launched = []  # type: ignore[attr-defined]
+
+    async def launch(index: int) -> BrowserSlot:
+        slot = _slot(index)
+        pool.launched.append(slot)  # type: ignore[attr-defined]
+        return slot
+
+    pool._launch = launch  # type: ignore[method-assign]
+    idle: asyncio.Queue[BrowserSlot] = asyncio.Queue()
+    for slot in slots:
+        idle.put_nowait(slot)
+    pool._idle = idle
+    return pool
+
+
+def test_lease_relaunches_a_dead_browser() -> None:
+    async def run() -> None:
+        dead = _slot(0)
+        dead.browser.connected = False  # type: ignore[attr-defined]
+        pool = _pool([dead])
+        async with pool.lease() as page:
+            assert page is pool.launched[0].page  # type: ignore[attr-defined]
+        assert dead.browser.closed  # type: ignore[attr-defined]
+        assert pool._idle is not None
+        assert pool._idle.get_nowait() is pool.launched[0]  # type: ignore[attr-defined]
+
+    asyncio.run(run())
+
+
+def test_playwright_error_marks_the_slot_unhealthy() -> None:
+    async def run() -> None:
+        slot = _slot(0)
+        pool = _pool([slot])
+        with pytest.raises(PlaywrightError):
+            async with pool.lease():
+                raise PlaywrightError("Target crashed")
+        assert not slot.healthy
+        # The slot is handed back and relaunched on its next lease
+        async with pool.lease() as page:
+            assert page is pool.launched[0].page  # type: ignore[attr-defined]
+
+    asyncio.run(run())
+
+
+def test_lease_times_out_when_every_browser_is_busy() -> None:
+    async def run() -> None:
+        pool = _pool([_slot(0)], lease_timeout=0.05)
+        async with pool.lease():
+            with pytest.raises(RuntimeError, match="Timed out waiting for a free browser"):
+                async with pool.lease():
+                    pass
+        # Released slots can be leased again
+        async with pool.lease():
+            pass
+
+    asyncio.run(run())
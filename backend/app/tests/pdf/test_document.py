@@ -0,0 +1,43 @@
+from app.pdf.document import build_contract_document, error_page_html
+
+
+def page_html(body: str, head: str = "") -> str:
+    return f"<!DOCTYPE html><html><head>{head}</head><body>{body}</body></html>"
+
+
+def test_build_contract_document_one_section_per_page() -> None:
+    pages = [
+        page_html('<div class="a4-page">الصفحة الأولى</div>'),
+        page_html('<div class="a4-page">second</div>'),
+    ]
+    document = build_contract_document(pages)
+    assert document.count('class="contract-page"') == 2
+    assert 'id="contract-page-1"' in document
+    assert 'id="contract-page-2"' in document
+    assert "الصفحة الأولى" in document
+    assert "@page" in document
+
+
+def test_build_contract_document_hoists_stylesheets_once() -> None:
+    link = '<link rel="stylesheet" href="http://test/static/all.css">'
+    pages = [page_html("<p>a</p>", head=link), page_html(link + "<p>b</p>")]
+    document = build_contract_document(pages)
+    assert document.count("all.css") == 1
+    assert document.index("all.css") < document.index("<body>")
+
+
+def test_build_contract_document_scopes_inline_styles() -> None:
+    pages = [
+        page_html("<p>a</p>"),
+        page_html("<style>img { width: 500px; }</style><img src='x.png'>"),
+    ]
+    document = build_contract_document(pages)
+    assert "@scope (#contract-page-2)" in document
+    body = document[document.index("<body>"):]
+    assert "<style>" not in body
+
+
+def test_error_page_html_escapes_message() -> None:
+    html = error_page_html(3, "<bad>")
+    assert "Error rendering page 3" in html
+    assert "&lt;bad&gt;" in html
@@ -0,0 +1,40 @@
+import asyncio
+import io
+from pathlib import Path
+
+import pytest
+from PyPDF2 import PdfReader
+
+from app.core.config import settings
+from app.pdf.engines import NativeEngine, RenderEngine
+
+PAGE_HTML = """<html><head><link rel="stylesheet" href="http://contract.local/static/all.css"></head>
+<body><div class="a4-page"><div class="content"><div class="page1">
+<h1>3 | العمارة</h1><span>Contract 867</span>
+</div></div></div></body></html>"""
+
+
+class FailingEngine(RenderEngine):
+    name = "failing"
+
+    async def _print(self, pages: list[str], name: str) -> bytes:
+        raise RuntimeError("printer on fire")
+
+
+def test_engine_turns_print_errors_into_error_parts() -> None:
+    parts = asyncio.run(FailingEngine().print_pages([1, 2], ["<p>1</p>", "<p>2</p>"], set()))
+    assert [part.numbers for part in parts] == [[1], [2]]
+    assert all(part.failed for part in parts)
+
+
+@pytest.mark.skipif(
+    not Path(settings.PDF_NATIVE_FONT).exists(), reason="native engine font is not installed"
+)
+def test_native_engine_prints_one_page_per_template() -> None:
+    parts = asyncio.run(NativeEngine().print_pages([1, 2], [PAGE_HTML, PAGE_HTML], {2}))
+    assert [part.numbers for part in parts] == [[1], [2]]
+    assert [part.failed for part in parts] == [False, True]
+
+    reader = PdfReader(io.BytesIO(parts[0].pdf))
+    assert len(reader.pages) == 1
+    assert "Contract 867" in reader.pages[0].extract_text()
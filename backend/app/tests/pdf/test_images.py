@@ -0,0 +1,34 @@
+import io
+from pathlib import Path
+
+from PIL import Image
+
+from app.pdf.images import ImageVariants
+
+
+def png_bytes(size: tuple[int, int]) -> bytes:
+    image = Image.new("RGBA", size, (255, 255, 255, 255))
+    for x in range(0, size[0], 7):
+        for y in range(0, size[1], 5):
+            image.putpixel((x, y), (x % 256, y % 256, 0, 255))
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_image_variant_is_resized_and_cached(tmp_path: Path) -> None:
+    variants = ImageVariants(tmp_path)
+    source = png_bytes((3000, 4000))
+    variant = variants.get("photos/A1.png", source)
+    assert variant is not None
+    assert len(variant) < len(source)
+    with Image.open(io.BytesIO(variant)) as image:
+        assert image.mode == "RGB"
+        assert image.width < 3000 and image.height < 4000
+    assert len(list(tmp_path.glob("*.png"))) == 1
+    assert variants.get("photos/A1.png", source) == variant
+
+
+def test_image_variant_skips_non_images(tmp_path: Path) -> None:
+    variants = ImageVariants(tmp_path)
+    assert variants.get("css/base.css", b"body {}") is None
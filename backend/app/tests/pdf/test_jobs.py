@@ -0,0 +1,76 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models import ContractVersion, PdfJobStatus
+from app.pdf.jobs import PdfJobQueue
+
+
+async def wait_for_job(queue: PdfJobQueue, job_id: str) -> PdfJobStatus:
+    for _ in range(100):
+        job = await asyncio.to_thread(queue.get, job_id)
+        assert job
+        if job.status in (PdfJobStatus.done, PdfJobStatus.failed):
+            return job.status
+        await asyncio.sleep(0.01)
+    raise AssertionError("PDF job did not finish")
+
+
+def test_pdf_job_queue_renders_in_background() -> None:
+    async def render(client_id: int) -> ContractVersion:
+        return ContractVersion(client_id=client_id, version=3, input_key="key", sha256="0" * 64, size=1)
+
+    async def run() -> None:
+        queue = PdfJobQueue(workers=1, ttl=60)
+        await queue.start(render)
+        try:
+            job = await queue.enqueue(42)
+            assert job.status == PdfJobStatus.queued
+            assert await wait_for_job(queue, job.id) == PdfJobStatus.done
+            finished = queue.get(job.id)
+            assert finished
+            assert finished.version == 3
+        finally:
+            await queue.close()
+
+    asyncio.run(run())
+
+
+def test_pdf_job_queue_records_failures() -> None:
+    async def render(client_id: int) -> ContractVersion:
+        raise RuntimeError(f"Client {client_id} broke the printer")
+
+    async def run() -> None:
+        queue = PdfJobQueue(workers=1, ttl=60)
+        await queue.start(render)
+        try:
+            job = await queue.enqueue(7)
+            assert await wait_for_job(queue, job.id) == PdfJobStatus.failed
+            failed_job = queue.get(job.id)
+            assert failed_job
+            assert failed_job.error == "Client 7 broke the printer"
+        finally:
+            await queue.close()
+
+    asyncio.run(run())
+
+
+def test_pdf_job_queue_deletes_expired_jobs() -> None:
+    async def render(client_id: int) -> ContractVersion:
+        return ContractVersion(client_id=client_id, version=1, input_key="key", sha256="0" * 64, size=1)
+
+    async def run() -> str:
+        queue = PdfJobQueue(workers=1, ttl=60)
+        await queue.start(render)
+        try:
+            job = await queue.enqueue(5)
+            await wait_for_job(queue, job.id)
+            return job.id
+        finally:
+            await queue.close()
+
+    job_id = asyncio.run(run())
+    queue = PdfJobQueue(workers=1, ttl=60)
+    queue.expire()
+    assert queue.get(job_id)
+    queue.expire(now=datetime.utcnow() + timedelta(seconds=120))
+    assert queue.get(job_id) is None
@@ -0,0 +1,70 @@
+import asyncio
+import io
+from collections.abc import AsyncIterator
+
+from PyPDF2 import PdfReader, PdfWriter
+
+from app.pdf.merge import PrintedPart, error_pdf, merge_parts, stream_merged
+
+
+def blank_pdf(widths: list[int]) -> bytes:
+    writer = PdfWriter()
+    for width in widths:
+        writer.add_blank_page(width=width, height=100)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def page_widths(pdf: bytes) -> list[float]:
+    return [float(page.mediabox.width) for page in PdfReader(io.BytesIO(pdf)).pages]
+
+
+def test_merge_parts_orders_pages_by_number() -> None:
+    parts = [
+        PrintedPart([3, 4], blank_pdf([103, 104])),
+        PrintedPart([1, 2, 5], blank_pdf([101, 102, 105])),
+    ]
+    assert page_widths(merge_parts(parts)) == [101, 102, 103, 104, 105]
+
+
+def test_merge_parts_places_error_part_at_first_number() -> None:
+    parts = [
+        PrintedPart([1, 3], blank_pdf([101, 103])),
+        PrintedPart([2, 4], error_pdf(["Error printing"]), failed=True),
+    ]
+    widths = page_widths(merge_parts(parts))
+    assert len(widths) == 3
+    assert widths[0] == 101
+    assert widths[2] == 103
+
+
+def test_stream_merged_yields_each_part_as_it_arrives() -> None:
+    async def parts() -> AsyncIterator[PrintedPart]:
+        yield PrintedPart([2], blank_pdf([102]))
+        yield PrintedPart([1, 3], blank_pdf([101, 103]))
+
+    async def collect() -> list[bytes]:
+        return [chunk async for chunk in stream_merged(parts())]
+
+    chunks = asyncio.run(collect())
+    # Header, one chunk per part, then the page tree and trailer
+    assert len(chunks) == 4
+    pdf = b"".join(chunks)
+    assert page_widths(pdf) == [101, 102, 103]
+    PdfReader(io.BytesIO(pdf), strict=True)
+
+
+def test_optimized_merge_writes_shared_objects_once() -> None:
+    parts = [
+        PrintedPart([1], error_pdf(["Same font on both pages"])),
+        PrintedPart([2], error_pdf(["Same font on both pages"])),
+    ]
+    plain = merge_parts(parts)
+    optimized = merge_parts(parts, optimize=True)
+    assert len(optimized) < len(plain)
+
+    reader = PdfReader(io.BytesIO(optimized), strict=True)
+    fonts = [page["/Resources"].raw_get("/Font").get_object().raw_get("/F1") for page in reader.pages]
+    assert fonts[0].idnum == fonts[1].idnum
+    assert reader.pages[1].extract_text().strip() == "Same font on both pages"
@@ -0,0 +1,28 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.pdf.metrics import StageMetrics
+
+
+def test_stage_metrics_render_histograms() -> None:
+    metrics = StageMetrics()
+    metrics.observe("navigation", 0.02, "1_2_3")
+    metrics.observe("navigation", 0.3, "1_2_3")
+    with metrics.stage("merge"):
+        pass
+    text = metrics.render()
+    assert "# TYPE contract_pdf_stage_seconds histogram" in text
+    labels = 'stage="navigation",pages="1_2_3"'
+    assert f'contract_pdf_stage_seconds_bucket{{{labels},le="0.025"}} 1' in text
+    assert f'contract_pdf_stage_seconds_bucket{{{labels},le="0.5"}} 2' in text
+    assert f'contract_pdf_stage_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"contract_pdf_stage_seconds_count{{{labels}}} 2" in text
+    assert 'stage="merge",pages="all"' in text
+
+
+def test_metrics_endpoint_requires_a_login(client: TestClient, superuser_token_headers: dict[str, str]) -> None:
+    url = f"{settings.API_V1_STR}/pages/metrics"
+    assert client.get(url).status_code == 401
+    response = client.get(url, headers=superuser_token_headers)
+    assert response.status_code == 200
+    assert "contract_pdf_admission_" in response.text
@@ -0,0 +1,102 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes import pages, utils
+from app.core.config import settings
+from app.main import app
+from app.pdf.merge import PrintedPart
+from app.pdf.page_cache import static_pages
+from app.pdf.warmup import Warmup
+
+
+def test_warmup_records_failed_steps_and_still_becomes_ready() -> None:
+    calls = []
+
+    async def ok() -> None:
+        calls.append("ok")
+
+    async def broken() -> None:
+        raise RuntimeError("no browser")
+
+    warmup = Warmup()
+    assert not warmup.ready
+    asyncio.run(warmup.run([("broken", broken), ("ok", ok)]))
+    assert calls == ["ok"]
+    status = warmup.status()
+    assert status["ready"]
+    assert status["errors"] == {"broken": "no browser"}
+    assert set(status["steps_ms"]) == {"broken", "ok"}
+
+
+def test_warmup_is_unhealthy_when_a_required_step_fails() -> None:
+    async def broken() -> None:
+        raise RuntimeError("no browser")
+
+    async def ok() -> None:
+        pass
+
+    warmup = Warmup()
+    asyncio.run(warmup.run([("fonts", broken), ("renderer", ok)], required={"renderer"}))
+    assert warmup.ready and warmup.healthy
+
+    warmup = Warmup()
+    asyncio.run(warmup.run([("fonts", ok), ("renderer", broken)], required={"renderer"}))
+    assert warmup.ready
+    assert not warmup.status()["healthy"]
+
+
+def test_readiness_follows_the_warmup(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    warmup = Warmup()
+    monkeypatch.setattr(utils, "pdf_warmup", warmup)
+    url = f"{settings.API_V1_STR}/utils/ready/"
+    assert client.get(url).status_code == 503
+
+    warmup.ready = True
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json()["ready"]
+
+    # A renderer that never started keeps the app out of rotation
+    warmup.healthy = False
+    assert client.get(url).status_code == 503
+
+
+class FakeEngine:
+    def __init__(self, fail: bool) -> None:
+        self.fail = fail
+        self.printed: list[int] = []
+
+    async def print_pages(self, numbers: list[int], pages: list[str], failed: set[int]) -> list[PrintedPart]:
+        self.printed.extend(numbers)
+        return [PrintedPart(numbers, b"%PDF-", failed=self.fail or bool(failed))]
+
+
+@pytest.mark.parametrize("fail", [False, True])
+def test_warm_up_prints_the_static_pages_into_their_cache(monkeypatch: pytest.MonkeyPatch, fail: bool) -> None:
+    engine = FakeEngine(fail)
+
+    @asynccontextmanager
+    async def contract_engine() -> AsyncIterator[FakeEngine]:
+        yield engine
+
+    async def start() -> None:
+        pass
+
+    warmup = Warmup()
+    monkeypatch.setattr(pages, "pdf_warmup", warmup)
+    monkeypatch.setattr(pages, "_contract_engine", contract_engine)
+    monkeypatch.setattr(pages.browser_pool, "start", start)
+    monkeypatch.setattr(settings, "PDF_RENDER_WORKERS", 0)
+    static_pages.clear()
+    try:
+        asyncio.run(pages.warm_up_contract_pipeline(app))
+        assert engine.printed == [4, 5, 6, 7]
+        # A failed print is not cached and keeps the app unready
+        assert (static_pages.get("static") is None) is fail
+        assert warmup.healthy is not fail
+    finally:
+        static_pages.clear()
@@ -0,0 +1,53 @@
+import asyncio
+import io
+from pathlib import Path
+
+import pytest
+from PyPDF2 import PdfReader
+
+from app.core.config import settings
+from app.pdf.workers import RenderWorkerPool
+
+PAGE_HTML = "<html><body><div class='content'><h1>Contract 867</h1></div></body></html>"
+
+pytestmark = pytest.mark.skipif(
+    not Path(settings.PDF_NATIVE_FONT).exists(), reason="native engine font is not installed"
+)
+
+
+def test_render_worker_prints_pages_out_of_process(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "PDF_NATIVE_PAGES", [1])
+
+    async def run() -> None:
+        pool = RenderWorkerPool(size=1, lease_timeout=30.0, job_timeout=60.0)
+        try:
+            parts = await pool.print_pages([1], [PAGE_HTML], set())
+            assert [part.numbers for part in parts] == [[1]]
+            assert not parts[0].failed
+            reader = PdfReader(io.BytesIO(parts[0].pdf))
+            assert "Contract 867" in reader.pages[0].extract_text()
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
+
+
+def test_render_worker_is_replaced_after_a_crash(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "PDF_NATIVE_PAGES", [1])
+
+    async def run() -> None:
+        pool = RenderWorkerPool(size=1, lease_timeout=30.0, job_timeout=60.0)
+        try:
+            await pool.start()
+            assert pool._idle is not None
+            worker = pool._idle.get_nowait()
+            worker.process.kill()
+            worker.process.join()
+            pool._idle.put_nowait(worker)
+
+            parts = await pool.print_pages([1], [PAGE_HTML], set())
+            assert not parts[0].failed
+        finally:
+            await pool.close()
+
+    asyncio.run(run())
@@ -13,4 +13,6 @@ def create_random_item(db: Session) -> Item:
     title = random_lower_string()
     description = random_lower_string()
     item_in = ItemCreate(title=title, description=description)
-    return crud.create_item(session=db, item_in=item_in, owner_id=owner_id)
+    item = crud.create_item(session=db, item_in=item_in, owner_id=owner_id)
+    db.commit()
+    return item